@@ -0,0 +1 @@
+"""CRUD helpers kept separate from the route handlers."""
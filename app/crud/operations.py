@@ -0,0 +1,36 @@
+"""Write path for operations, bypassing the ORM unit of work.
+
+Posting an operation always inserts one header row plus a handful of
+journal-entry legs. Going through Core insert() statements built once at
+import time skips the per-request statement construction and the flush
+machinery; SQLAlchemy's compiled-statement cache then reuses the compiled
+SQL across calls. The ORM path (session.add + relationships) remains the
+right tool when cascades or loaded objects are needed — these helpers are
+for the hot POST endpoints only.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from ..models.journal_entry import JournalEntry
+from ..models.operation import Operation
+
+# Built once; execution with a params dict/list lets SQLAlchemy cache the
+# compiled form and use executemany for the journal legs.
+_INSERT_OPERATION = insert(Operation).returning(Operation.id)
+_INSERT_JOURNAL_ENTRIES = insert(JournalEntry)
+
+
+def create_operation(session: Session, operation: dict, journal_entries: list) -> int:
+    """Insert an operation header and its journal legs; return the new id.
+
+    ``operation`` maps Operation column names to values; ``journal_entries``
+    is a list of dicts without operation_id, which is filled in here. The
+    caller owns the transaction (commit/rollback).
+    """
+    operation_id = session.execute(_INSERT_OPERATION, operation).scalar_one()
+    session.execute(
+        _INSERT_JOURNAL_ENTRIES,
+        [{**row, "operation_id": operation_id} for row in journal_entries],
+    )
+    return operation_id
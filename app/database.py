@@ -7,22 +7,62 @@ connection string should point to a PostgreSQL instance (e.g. Supabase/Neon).
 """
 
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 
 
 # Read the database URL from the environment. Use SQLite for local development.
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./finance_app.db")
 
-# SQLAlchemy engine. `connect_args` are required for SQLite.
-if DATABASE_URL.startswith("sqlite"):
+# SQLAlchemy engine with explicit pooling. Without it, SQLite falls back to
+# SingletonThreadPool, which reopens connections per thread under load.
+# `connect_args` are required for SQLite.
+if DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    # A single shared connection, or each pool checkout would see its own
+    # empty in-memory database.
+    engine = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+elif DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},  # Needed for SQLite
+        poolclass=QueuePool,
+        pool_size=10,
+        max_overflow=20,
+        pool_pre_ping=True,
+        pool_recycle=3600,
     )
 else:
-    engine = create_engine(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=30,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+    )
+
+if DATABASE_URL.startswith("sqlite"):
+    # Mirror the pragma tuning used by the raw-sqlite3 path: WAL keeps
+    # readers and the writer from blocking each other, and
+    # synchronous=NORMAL under WAL skips the per-commit database fsync.
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, connection_record):
+        cur = dbapi_conn.cursor()
+        for pragma in (
+            "journal_mode=WAL",
+            "synchronous=NORMAL",
+            "busy_timeout=5000",
+            "cache_size=-20000",
+            "temp_store=MEMORY",
+            "foreign_keys=ON",
+        ):
+            cur.execute("PRAGMA " + pragma)
+        cur.close()
+
 
 # Create a configured "Session" class and base class for declarative models.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,25 @@
+"""Shared sqlite3 connection helper for the standalone scripts.
+
+The seed and example scripts are write-heavy; opening their connections in
+WAL mode with relaxed synchronous and a large page cache removes the
+per-statement fsync serialization of the default rollback journal.
+"""
+
+import sqlite3
+
+
+def connect(db_file: str) -> sqlite3.Connection:
+    """Open a sqlite3 connection tuned for bulk writes.
+
+    isolation_level=None disables implicit transaction management, so
+    callers must wrap multi-statement batches in explicit BEGIN/COMMIT.
+    """
+    conn = sqlite3.connect(db_file, isolation_level=None, check_same_thread=False)
+    conn.executescript(
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA cache_size=-65536;"
+        "PRAGMA temp_store=MEMORY;"
+        "PRAGMA mmap_size=268435456;"
+    )
+    return conn
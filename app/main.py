@@ -5,7 +5,10 @@ authentication, CRUD operations and reports. In Phase 1 we focus on
 database creation and seeding; the routers will be added in later phases.
 """
 
+import os
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from .database import Base, engine
 from .routers import auth, parties, operations, reports, accounts
@@ -13,10 +16,17 @@ from .routers import auth, parties, operations, reports, accounts
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
-    app = FastAPI(title="Finance Operations API", version="0.1.0")
-
-    # Create database tables if they don't exist
-    Base.metadata.create_all(bind=engine)
+    app = FastAPI(
+        title="Finance Operations API",
+        version="0.1.0",
+        default_response_class=ORJSONResponse,
+    )
+
+    # Creating tables on every boot costs 20+ PRAGMA table_info round-trips
+    # even when nothing changes. Opt in via APP_INIT_DB=1 on first deploy
+    # (or run seed_db.py); normal starts skip it.
+    if os.environ.get("APP_INIT_DB", "0") == "1":
+        Base.metadata.create_all(bind=engine)
 
     # Include routers (empty for now; to be implemented in later phases)
     for router in [auth.router, parties.router, operations.router, reports.router, accounts.router]:
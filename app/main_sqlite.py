@@ -8,58 +8,345 @@ environment. In production you should switch to SQLAlchemy and a proper
 JWT implementation.
 """
 
+import atexit
 import os
+import queue
 import sqlite3
 import hashlib
+import hmac
 import secrets
+import threading
+import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 
 from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import BaseModel, EmailStr
 
 
 DB_FILE = os.environ.get("DB_PATH", "finance.db")
 
-app = FastAPI(title="Finance API (sqlite)")
+# orjson serializes the large report payloads (lists of dicts) several times
+# faster than the stdlib json encoder.
+app = FastAPI(title="Finance API (sqlite)", default_response_class=ORJSONResponse)
 
 
-# In‑memory token store: token -> user email
+# In‑memory token store: token -> {"email": ..., "user_id": ..., "expires": ...}.
+# Entries expire after TOKEN_TTL_SECONDS; a sweep every _TOKEN_SWEEP_INTERVAL
+# lookups keeps the dict bounded without a timer thread or a new dependency.
+# login runs in a worker thread while the sweep iterates on another, so all
+# TOKEN_STORE access goes through _TOKEN_LOCK.
 TOKEN_STORE = {}
+TOKEN_TTL_SECONDS = 3600
+_TOKEN_LOCK = threading.Lock()
+_TOKEN_SWEEP_INTERVAL = 1024
+_token_lookups = 0
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_db_connection():
-    """Provide a new sqlite3 connection for each request."""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
+# WAL journal mode is persistent in the database file, so it only needs to be
+# switched on by the first connection after startup.
+_WAL_ENABLED = False
+
+
+def apply_pragmas(conn: sqlite3.Connection) -> None:
+    """Tune SQLite for this write-heavy workload.
+
+    WAL lets readers proceed while a writer commits, and synchronous=NORMAL
+    under WAL skips the per-commit fsync of the main database file. The
+    remaining pragmas are per-connection settings.
+    """
+    global _WAL_ENABLED
+    if not _WAL_ENABLED:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _WAL_ENABLED = True
+    # Tests set TESTING=1: durability across a crash is irrelevant there,
+    # so skip WAL fsyncs entirely instead of deferring them.
+    if os.environ.get("TESTING") == "1":
+        conn.execute("PRAGMA synchronous=OFF")
+    else:
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_spill=OFF")  # transactions here are small
+    conn.execute("PRAGMA foreign_keys=ON")
+
+
+def ensure_indexes(conn: sqlite3.Connection) -> None:
+    """Create indexes the hot paths rely on.
+
+    Databases created before the schema change lack the unique index on
+    parties.name that the upsert in get_or_create_party needs. No-op until
+    the schema itself exists.
+    """
+    try:
+        try:
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_parties_name ON parties (name)")
+        except sqlite3.IntegrityError:
+            # A pre-series database may hold duplicate names (create_party
+            # used to do a bare INSERT). Fail fast with instructions rather
+            # than 500ing every write with an opaque pool error.
+            raise RuntimeError(
+                "parties contains duplicate names, so the unique index the "
+                "write path relies on cannot be created. Run "
+                "migrate_dedupe_parties.py against this database, then "
+                "restart the API."
+            ) from None
+        # Covering index for /reports/position: the aggregate reads only
+        # these four columns, so the scan never touches the table.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_je_acct_cur_cover "
+            "ON journal_entries (account_id, currency_id, debit, credit)"
+        )
+        # /reports/client_ledger filters operations by party and date range.
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_op_party_date ON operations (party_id, date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_cheques_status ON cheques (status)")
+        # Most cheque reports ask for pending cheques ordered by maturity;
+        # the partial index stays small and hot in cache.
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cheques_pending "
+            "ON cheques (due_date) WHERE status = 'pending'"
+        )
+    except sqlite3.OperationalError:
+        pass  # schema not initialised yet
+
+
+class ConnectionPool:
+    """Fixed-size pool of pre-opened sqlite3 connections.
+
+    Under WAL SQLite allows many concurrent readers but only one writer, so
+    the app keeps a pool of read-only connections sized to the CPU count and
+    a single-connection write pool. Opening a connection costs three file
+    opens (db/wal/shm) plus pragma setup, so connections are opened once and
+    reused across requests.
+
+    If the database file has been replaced on disk or DB_FILE repointed (the
+    tests do both), stale handles still reference the old database, so the
+    pool is keyed on the path and inode and rebuilt when either changes.
+    """
+
+    _UNSET = object()
+
+    # How long a request may wait for a free connection before giving up.
+    # Bounded so a leaked or stuck connection degrades to 503s instead of
+    # wedging every request behind an indefinite queue wait.
+    CHECKOUT_TIMEOUT_SECONDS = 10
+
+    def __init__(self, size: int, read_only: bool = False):
+        self.size = size
+        self.read_only = read_only
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._key = self._UNSET
+        self._live = set()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            DB_FILE,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=200,
+            # The tests point DB_FILE at shared-cache memory URIs.
+            uri=DB_FILE.startswith("file:"),
+        )
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn)
+        if not self.read_only:
+            ensure_indexes(conn)
+        conn.execute("PRAGMA query_only=%d" % (1 if self.read_only else 0))
+        return conn
+
+    @staticmethod
+    def _current_key():
+        # Path plus inode: catches both DB_FILE being repointed (URIs have
+        # no inode) and the file being deleted and recreated in place.
+        try:
+            return (DB_FILE, os.stat(DB_FILE).st_ino)
+        except (FileNotFoundError, OSError):
+            return (DB_FILE, None)
+
+    def checkout(self) -> sqlite3.Connection:
+        global _WAL_ENABLED
+        with self._lock:
+            if self._key != self._current_key():
+                while not self._queue.empty():
+                    self._queue.get_nowait().close()
+                self._live.clear()
+                _WAL_ENABLED = False  # a replacement file starts without WAL
+                _CODE_CACHE.clear()  # seed-table ids may differ in the new file
+                for _ in range(self.size):
+                    conn = self._open()
+                    self._live.add(id(conn))
+                    self._queue.put(conn)
+                self._key = self._current_key()
+        try:
+            return self._queue.get(timeout=self.CHECKOUT_TIMEOUT_SECONDS)
+        except queue.Empty:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database connection pool exhausted",
+            )
+
+    def checkin(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            if id(conn) in self._live:
+                self._queue.put(conn)
+                return
+        # Pool was rebuilt while this connection was checked out.
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            while not self._queue.empty():
+                self._queue.get_nowait().close()
+            self._live.clear()
+            self._key = self._UNSET
+
+
+_read_pool = ConnectionPool(os.cpu_count() or 4, read_only=True)
+_write_pool = ConnectionPool(1)
+
+
+@atexit.register
+def _close_pools() -> None:
+    _read_pool.close()
+    _write_pool.close()
+
+
+def get_reader():
+    """Dependency: a read-only connection for GET/report endpoints.
+
+    Deliberately sync: FastAPI then resolves it in the thread pool, so a
+    checkout that has to wait for a free connection blocks a worker thread,
+    not the event loop. (As an async dependency, two concurrent writes
+    deadlocked the loop: one waiting on the queue, the other unable to
+    return its connection.)
+    """
+    conn = _read_pool.checkout()
     try:
         yield conn
     finally:
-        conn.close()
+        _read_pool.checkin(conn)
+
+
+def get_writer():
+    """Dependency: the (single) writer connection for mutating endpoints.
+
+    Sync for the same reason as get_reader — with a single-connection pool
+    an event-loop blocking wait here is an instant deadlock under
+    concurrent writes.
+    """
+    conn = _write_pool.checkout()
+    try:
+        yield conn
+        if conn.in_transaction:
+            conn.commit()
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+    finally:
+        _write_pool.checkin(conn)
+
+
+PBKDF2_ITERATIONS = 100_000
 
 
-def authenticate_user(conn: sqlite3.Connection, email: str, password: str) -> bool:
+def hash_password(password: str) -> str:
+    """Hash a password with PBKDF2-HMAC-SHA256.
+
+    The whole key derivation iterates inside OpenSSL's C implementation, so
+    it benefits from SHA-NI where available with no Python loop overhead.
+    """
+    salt = secrets.token_bytes(16)
+    derived = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${derived.hex()}"
+
+
+def verify_password(password: str, stored: str) -> bool:
+    """Check a password against a stored hash.
+
+    New hashes use PBKDF2-HMAC-SHA256; plain SHA-256 hex digests written by
+    older database seeds are still accepted (dual-read migration path).
+    """
+    if stored.startswith("pbkdf2_sha256$"):
+        _, iterations, salt_hex, hash_hex = stored.split("$")
+        derived = hashlib.pbkdf2_hmac(
+            "sha256", password.encode(), bytes.fromhex(salt_hex), int(iterations)
+        )
+        return hmac.compare_digest(derived.hex(), hash_hex)
+    legacy = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(legacy, stored)
+
+
+def authenticate_user(conn: sqlite3.Connection, email: str, password: str) -> Optional[int]:
+    """Return the user's id if the credentials are valid, otherwise None."""
     cur = conn.cursor()
     cur.execute(
-        "SELECT hashed_password FROM users WHERE email = ? AND is_active = 1",
+        "SELECT id, hashed_password FROM users WHERE email = ? AND is_active = 1",
         (email,),
     )
     row = cur.fetchone()
     if not row:
-        return False
-    hashed = hashlib.sha256(password.encode()).hexdigest()
-    return hashed == row["hashed_password"]
+        return None
+    if not verify_password(password, row["hashed_password"]):
+        return None
+    return row["id"]
 
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> str:
-    """Retrieve the user email associated with the token."""
-    email = TOKEN_STORE.get(token)
-    if not email:
+def _sweep_expired_tokens(now: float) -> None:
+    with _TOKEN_LOCK:
+        expired = [t for t, u in TOKEN_STORE.items() if u["expires"] <= now]
+        for t in expired:
+            del TOKEN_STORE[t]
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
+    """Retrieve the user record (email and id) associated with the token."""
+    global _token_lookups
+    now = time.monotonic()
+    _token_lookups += 1
+    if _token_lookups % _TOKEN_SWEEP_INTERVAL == 0:
+        _sweep_expired_tokens(now)
+    with _TOKEN_LOCK:
+        user = TOKEN_STORE.get(token)
+        if not user or user["expires"] <= now:
+            TOKEN_STORE.pop(token, None)
+            user = None
+    if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return email
+    return user
+
+
+# Hot-path SQL promoted to module-level constants so every request reuses the
+# same string object and sqlite3's per-connection statement cache always hits.
+SQL_INSERT_OPERATION = (
+    "INSERT INTO operations (date, operation_type_id, party_id, amount, currency_id, exchange_rate, notes, user_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_INSERT_JOURNAL_ENTRY = (
+    "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+SQL_INSERT_FX_DETAIL = (
+    "INSERT INTO fx_details (operation_id, usd_amount, ars_amount, fx_type) VALUES (?, ?, ?, ?)"
+)
+SQL_INSERT_PAYMENT_DETAIL = (
+    "INSERT INTO payment_details (operation_id, gross_amount, commission_amount, commission_percentage, expenses_amount, payment_method) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_INSERT_RECEIPT_DETAIL = (
+    "INSERT INTO receipt_details (operation_id, gross_amount, commission_amount, commission_percentage, expenses_amount, payment_method) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+SQL_INSERT_CHEQUE = (
+    "INSERT INTO cheques (operation_id, party_id, bank, number, nominal_amount, issue_date, due_date, expected_accreditation_date, interest_rate, interest_base, expenses, commissions, net_amount, status, currency_id) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)"
+)
 
 
 # Pydantic models
@@ -105,64 +392,130 @@ class PositionReport(BaseModel):
 
 
 @app.post("/auth/login", response_model=Token)
-def login(data: LoginRequest, db: sqlite3.Connection = Depends(get_db_connection)):
-    if not authenticate_user(db, data.email, data.password):
+def login(data: LoginRequest, db: sqlite3.Connection = Depends(get_reader)):
+    user_id = authenticate_user(db, data.email, data.password)
+    if user_id is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     token = secrets.token_hex(16)
-    TOKEN_STORE[token] = data.email
+    with _TOKEN_LOCK:
+        TOKEN_STORE[token] = {
+            "email": data.email,
+            "user_id": user_id,
+            "expires": time.monotonic() + TOKEN_TTL_SECONDS,
+        }
     return {"access_token": token, "token_type": "bearer"}
 
 
 @app.post("/parties", response_model=PartyOut)
-def create_party(party: PartyCreate, user: str = Depends(get_current_user), db: sqlite3.Connection = Depends(get_db_connection)):
+def create_party(party: PartyCreate, user: dict = Depends(get_current_user), db: sqlite3.Connection = Depends(get_writer)):
     cur = db.cursor()
-    cur.execute(
-        "INSERT INTO parties (name, type, email, phone, address, created_at, updated_at) "
-        "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
-        (party.name, party.type, party.email, party.phone, party.address),
-    )
+    cur.execute("BEGIN IMMEDIATE")
+    try:
+        cur.execute(
+            "INSERT INTO parties (name, type, email, phone, address, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+            (party.name, party.type, party.email, party.phone, party.address),
+        )
+    except sqlite3.IntegrityError:
+        # parties.name is unique; surface the duplicate instead of a 500.
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Party '{party.name}' already exists",
+        )
     db.commit()
     party_id = cur.lastrowid
     return PartyOut(id=party_id, name=party.name, type=party.type, email=party.email, phone=party.phone, address=party.address)
 
 
-@app.get("/parties", response_model=List[PartyOut])
-def list_parties(user: str = Depends(get_current_user), db: sqlite3.Connection = Depends(get_db_connection)):
+@app.get("/parties")
+def list_parties(user: dict = Depends(get_current_user), db: sqlite3.Connection = Depends(get_reader)):
+    """List all parties.
+
+    Rows come straight from the database, so they are returned as plain
+    dicts (same shape as `PartyOut`) rather than re-validating trusted data
+    through Pydantic on every row.
+    """
     cur = db.cursor()
     cur.execute("SELECT id, name, type, email, phone, address FROM parties")
-    rows = cur.fetchall()
-    return [PartyOut(**row) for row in rows]
+    return [dict(row) for row in cur]
 
 
-def get_id_by_code(conn: sqlite3.Connection, table: str, code: str) -> int:
+# Lazily populated code -> id cache for the seed tables, whose rows are
+# effectively immutable. Keyed by table name, then code. The whitelist also
+# keeps the f-string query safe. Cleared when the database file is replaced
+# (see ConnectionPool.checkout).
+_CODE_TABLES = {"accounts", "currencies", "operation_types"}
+_CODE_CACHE: dict = {}
+
+
+def _load_code_table(conn: sqlite3.Connection, table: str) -> dict:
     cur = conn.cursor()
-    cur.execute(f"SELECT id FROM {table} WHERE code = ?", (code,))
-    row = cur.fetchone()
-    if not row:
+    cur.execute(f"SELECT code, id FROM {table}")
+    cache = {row["code"]: row["id"] for row in cur.fetchall()}
+    _CODE_CACHE[table] = cache
+    return cache
+
+
+def get_id_by_code(conn: sqlite3.Connection, table: str, code: str) -> int:
+    if table not in _CODE_TABLES:
+        raise ValueError(f"Unknown code table: {table}")
+    cache = _CODE_CACHE.get(table)
+    if cache is None:
+        cache = _load_code_table(conn, table)
+    try:
+        return cache[code]
+    except KeyError:
         raise HTTPException(status_code=400, detail=f"Code {code} not found in {table}")
-    return row["id"]
+
+
+@app.on_event("startup")
+def warm_code_cache() -> None:
+    """Preload the code -> id maps so even the first requests skip the lookup.
+
+    The chart of accounts, currencies and operation types are static seed
+    data. If the database has not been initialised yet the cache simply fills
+    lazily on first use (and refills whenever the file is replaced).
+    """
+    if not os.path.exists(DB_FILE):
+        return
+    conn = _read_pool.checkout()
+    try:
+        for table in _CODE_TABLES:
+            _load_code_table(conn, table)
+    except sqlite3.OperationalError:
+        pass  # schema not created yet; fall back to lazy population
+    finally:
+        _read_pool.checkin(conn)
 
 
 def get_or_create_party(conn: sqlite3.Connection, name: str) -> int:
+    """Look up a party by name, inserting it as a client if missing.
+
+    A single upsert covers both the hit and the miss path: on conflict the
+    row is touched (updated_at) so RETURNING still yields its id. Runs
+    inside the caller's transaction; it must not commit.
+    """
     cur = conn.cursor()
-    cur.execute("SELECT id FROM parties WHERE name = ?", (name,))
-    row = cur.fetchone()
-    if row:
-        return row["id"]
     cur.execute(
-        "INSERT INTO parties (name, type, created_at, updated_at) VALUES (?, 'client', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)",
+        "INSERT INTO parties (name, type, created_at, updated_at) "
+        "VALUES (?, 'client', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(name) DO UPDATE SET updated_at = CURRENT_TIMESTAMP "
+        "RETURNING id",
         (name,),
     )
-    conn.commit()
-    return cur.lastrowid
+    return cur.fetchone()["id"]
 
 
 @app.post("/operations/fx")
-def create_fx(op: FXOperationCreate, user: str = Depends(get_current_user), db: sqlite3.Connection = Depends(get_db_connection)):
+def create_fx(op: FXOperationCreate, user: dict = Depends(get_current_user), db: sqlite3.Connection = Depends(get_writer)):
     # Validate fx_type
     if op.fx_type not in {"buy", "sell"}:
         raise HTTPException(status_code=400, detail="fx_type must be 'buy' or 'sell'")
     cur = db.cursor()
+    # Grab the write lock upfront so the transaction never has to upgrade
+    # mid-flight (which is what surfaces as SQLITE_BUSY under contention).
+    cur.execute("BEGIN IMMEDIATE")
     # Get or create party
     party_id = get_or_create_party(db, op.party_name)
     # Get type id
@@ -172,8 +525,7 @@ def create_fx(op: FXOperationCreate, user: str = Depends(get_current_user), db:
     ars_id = get_id_by_code(db, "currencies", "ARS")
     # Insert operation
     cur.execute(
-        "INSERT INTO operations (date, operation_type_id, party_id, amount, currency_id, exchange_rate, notes, user_id) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, (SELECT id FROM users WHERE email = ?))",
+        SQL_INSERT_OPERATION,
         (
             op.date.isoformat(),
             op_type_id,
@@ -182,14 +534,14 @@ def create_fx(op: FXOperationCreate, user: str = Depends(get_current_user), db:
             usd_id,
             op.exchange_rate,
             op.notes,
-            user,
+            user["user_id"],
         ),
     )
     operation_id = cur.lastrowid
     # Insert fx_details
     ars_amount = round(op.usd_amount * op.exchange_rate, 2)
     cur.execute(
-        "INSERT INTO fx_details (operation_id, usd_amount, ars_amount, fx_type) VALUES (?, ?, ?, ?)",
+        SQL_INSERT_FX_DETAIL,
         (operation_id, op.usd_amount, ars_amount, op.fx_type),
     )
     # Journal entries
@@ -197,30 +549,23 @@ def create_fx(op: FXOperationCreate, user: str = Depends(get_current_user), db:
     ars_account_id = get_id_by_code(db, "accounts", "1010")
     if op.fx_type == "buy":
         # Debit USD, credit ARS
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-            (operation_id, usd_account_id, op.usd_amount, usd_id),
-        )
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-            (operation_id, ars_account_id, ars_amount, ars_id),
-        )
+        entries = [
+            (operation_id, usd_account_id, op.usd_amount, 0, usd_id),
+            (operation_id, ars_account_id, 0, ars_amount, ars_id),
+        ]
     else:
         # sell: debit ARS, credit USD
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-            (operation_id, ars_account_id, ars_amount, ars_id),
-        )
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-            (operation_id, usd_account_id, op.usd_amount, usd_id),
-        )
+        entries = [
+            (operation_id, ars_account_id, ars_amount, 0, ars_id),
+            (operation_id, usd_account_id, 0, op.usd_amount, usd_id),
+        ]
+    cur.executemany(SQL_INSERT_JOURNAL_ENTRY, entries)
     db.commit()
     return {"operation_id": operation_id}
 
 
 @app.get("/reports/position", response_model=PositionReport)
-def get_position(user: str = Depends(get_current_user), db: sqlite3.Connection = Depends(get_db_connection)):
+def get_position(user: dict = Depends(get_current_user), db: sqlite3.Connection = Depends(get_reader)):
     cur = db.cursor()
     # USD position
     usd_account_id = get_id_by_code(db, "accounts", "1020")
@@ -264,7 +609,7 @@ class ReceiptOperationCreate(BaseModel):
 
 
 @app.post("/operations/payment")
-def create_payment(op: PaymentOperationCreate, user: str = Depends(get_current_user), db: sqlite3.Connection = Depends(get_db_connection)):
+def create_payment(op: PaymentOperationCreate, user: dict = Depends(get_current_user), db: sqlite3.Connection = Depends(get_writer)):
     # Determine amounts
     commission = op.commission_amount or 0
     if op.commission_percentage:
@@ -273,6 +618,7 @@ def create_payment(op: PaymentOperationCreate, user: str = Depends(get_current_u
     total_paid = op.gross_amount + commission + expenses
     # Determine currency IDs and accounts
     cur = db.cursor()
+    cur.execute("BEGIN IMMEDIATE")
     currency_id = get_id_by_code(db, "currencies", op.currency)
     party_id = get_or_create_party(db, op.party_name)
     # Determine party account (suppliers if type is supplier, otherwise clients)
@@ -290,23 +636,22 @@ def create_payment(op: PaymentOperationCreate, user: str = Depends(get_current_u
     # Insert operation header
     op_type_id = get_id_by_code(db, "operation_types", "PAYMENT")
     cur.execute(
-        "INSERT INTO operations (date, operation_type_id, party_id, amount, currency_id, exchange_rate, notes, user_id) "
-        "VALUES (?, ?, ?, ?, ?, NULL, ?, (SELECT id FROM users WHERE email = ?))",
+        SQL_INSERT_OPERATION,
         (
             op.date.isoformat(),
             op_type_id,
             party_id,
             op.gross_amount,
             currency_id,
+            None,
             op.notes,
-            user,
+            user["user_id"],
         ),
     )
     operation_id = cur.lastrowid
     # Insert payment_details
     cur.execute(
-        "INSERT INTO payment_details (operation_id, gross_amount, commission_amount, commission_percentage, expenses_amount, payment_method) "
-        "VALUES (?, ?, ?, ?, ?, ?)",
+        SQL_INSERT_PAYMENT_DETAIL,
         (
             operation_id,
             op.gross_amount,
@@ -317,33 +662,24 @@ def create_payment(op: PaymentOperationCreate, user: str = Depends(get_current_u
         ),
     )
     # Journal entries: debit party account (gross), debit commission expense, debit expenses, credit cash total
-    # Debit party account (reduces liability)
-    cur.execute(
-        "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-        (operation_id, party_account_id, op.gross_amount, currency_id),
-    )
+    entries = [
+        # Debit party account (reduces liability)
+        (operation_id, party_account_id, op.gross_amount, 0, currency_id),
+    ]
     if commission > 0:
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-            (operation_id, commission_expense_id, commission, currency_id),
-        )
+        entries.append((operation_id, commission_expense_id, commission, 0, currency_id))
     if expenses > 0:
         # Use same expense account for expenses
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-            (operation_id, commission_expense_id, expenses, currency_id),
-        )
+        entries.append((operation_id, commission_expense_id, expenses, 0, currency_id))
     # Credit cash
-    cur.execute(
-        "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-        (operation_id, cash_account_id, total_paid, currency_id),
-    )
+    entries.append((operation_id, cash_account_id, 0, total_paid, currency_id))
+    cur.executemany(SQL_INSERT_JOURNAL_ENTRY, entries)
     db.commit()
     return {"operation_id": operation_id, "total_paid": total_paid}
 
 
 @app.post("/operations/receipt")
-def create_receipt(op: ReceiptOperationCreate, user: str = Depends(get_current_user), db: sqlite3.Connection = Depends(get_db_connection)):
+def create_receipt(op: ReceiptOperationCreate, user: dict = Depends(get_current_user), db: sqlite3.Connection = Depends(get_writer)):
     # Determine amounts
     commission = op.commission_amount or 0
     if op.commission_percentage:
@@ -354,6 +690,7 @@ def create_receipt(op: ReceiptOperationCreate, user: str = Depends(get_current_u
         raise HTTPException(status_code=400, detail="Net amount cannot be negative")
     # Determine currency and accounts
     cur = db.cursor()
+    cur.execute("BEGIN IMMEDIATE")
     currency_id = get_id_by_code(db, "currencies", op.currency)
     party_id = get_or_create_party(db, op.party_name)
     cur.execute("SELECT type FROM parties WHERE id = ?", (party_id,))
@@ -369,23 +706,22 @@ def create_receipt(op: ReceiptOperationCreate, user: str = Depends(get_current_u
     # Insert operation
     op_type_id = get_id_by_code(db, "operation_types", "RECEIPT")
     cur.execute(
-        "INSERT INTO operations (date, operation_type_id, party_id, amount, currency_id, exchange_rate, notes, user_id) "
-        "VALUES (?, ?, ?, ?, ?, NULL, ?, (SELECT id FROM users WHERE email = ?))",
+        SQL_INSERT_OPERATION,
         (
             op.date.isoformat(),
             op_type_id,
             party_id,
             op.gross_amount,
             currency_id,
+            None,
             op.notes,
-            user,
+            user["user_id"],
         ),
     )
     operation_id = cur.lastrowid
     # Insert receipt_details
     cur.execute(
-        "INSERT INTO receipt_details (operation_id, gross_amount, commission_amount, commission_percentage, expenses_amount, payment_method) "
-        "VALUES (?, ?, ?, ?, ?, ?)",
+        SQL_INSERT_RECEIPT_DETAIL,
         (
             operation_id,
             op.gross_amount,
@@ -396,28 +732,19 @@ def create_receipt(op: ReceiptOperationCreate, user: str = Depends(get_current_u
         ),
     )
     # Journal entries
-    # Credit party account (reduces receivable)
-    cur.execute(
-        "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-        (operation_id, party_account_id, op.gross_amount, currency_id),
-    )
-    # Debit cash (net received)
-    cur.execute(
-        "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-        (operation_id, cash_account_id, net_received, currency_id),
-    )
+    entries = [
+        # Credit party account (reduces receivable)
+        (operation_id, party_account_id, 0, op.gross_amount, currency_id),
+        # Debit cash (net received)
+        (operation_id, cash_account_id, net_received, 0, currency_id),
+    ]
     # Credit commission income
     if commission > 0:
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-            (operation_id, commission_income_id, commission, currency_id),
-        )
+        entries.append((operation_id, commission_income_id, 0, commission, currency_id))
     # Expenses in receipt: treat as income (we charge them to client)
     if expenses > 0:
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-            (operation_id, commission_income_id, expenses, currency_id),
-        )
+        entries.append((operation_id, commission_income_id, 0, expenses, currency_id))
+    cur.executemany(SQL_INSERT_JOURNAL_ENTRY, entries)
     db.commit()
     return {"operation_id": operation_id, "net_received": net_received}
 
@@ -440,7 +767,7 @@ class ChequeBuyOperationCreate(BaseModel):
 
 
 @app.post("/operations/cheque_buy")
-def create_cheque_buy(op: ChequeBuyOperationCreate, user: str = Depends(get_current_user), db: sqlite3.Connection = Depends(get_db_connection)):
+def create_cheque_buy(op: ChequeBuyOperationCreate, user: dict = Depends(get_current_user), db: sqlite3.Connection = Depends(get_writer)):
     # Compute time difference in days for interest calculation
     days = (op.due_date.date() - op.date.date()).days
     # Interest amount
@@ -451,28 +778,28 @@ def create_cheque_buy(op: ChequeBuyOperationCreate, user: str = Depends(get_curr
     if net_amount < 0:
         raise HTTPException(status_code=400, detail="Net amount cannot be negative")
     cur = db.cursor()
+    cur.execute("BEGIN IMMEDIATE")
     currency_id = get_id_by_code(db, "currencies", op.currency)
     party_id = get_or_create_party(db, op.party_name)
     # Insert operation header
     op_type_id = get_id_by_code(db, "operation_types", "CHEQUE_BUY")
     cur.execute(
-        "INSERT INTO operations (date, operation_type_id, party_id, amount, currency_id, exchange_rate, notes, user_id) "
-        "VALUES (?, ?, ?, ?, ?, NULL, ?, (SELECT id FROM users WHERE email = ?))",
+        SQL_INSERT_OPERATION,
         (
             op.date.isoformat(),
             op_type_id,
             party_id,
             op.nominal_amount,
             currency_id,
+            None,
             op.notes,
-            user,
+            user["user_id"],
         ),
     )
     operation_id = cur.lastrowid
     # Insert cheque record
     cur.execute(
-        "INSERT INTO cheques (operation_id, party_id, bank, number, nominal_amount, issue_date, due_date, expected_accreditation_date, interest_rate, interest_base, expenses, commissions, net_amount, status, currency_id) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 'pending', ?)",
+        SQL_INSERT_CHEQUE,
         (
             operation_id,
             party_id,
@@ -496,34 +823,22 @@ def create_cheque_buy(op: ChequeBuyOperationCreate, user: str = Depends(get_curr
     interest_income_id = get_id_by_code(db, "accounts", "5400")
     commission_income_id = get_id_by_code(db, "accounts", "5200")
     commission_expense_id = get_id_by_code(db, "accounts", "5300")
-    # Debit cheque portfolio (asset)
-    cur.execute(
-        "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-        (operation_id, cheque_account_id, op.nominal_amount, currency_id),
-    )
-    # Credit cash (net amount paid)
-    cur.execute(
-        "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-        (operation_id, cash_account_id, net_amount, currency_id),
-    )
+    entries = [
+        # Debit cheque portfolio (asset)
+        (operation_id, cheque_account_id, op.nominal_amount, 0, currency_id),
+        # Credit cash (net amount paid)
+        (operation_id, cash_account_id, 0, net_amount, currency_id),
+    ]
     # Credit interest income
     if interest_amount > 0:
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-            (operation_id, interest_income_id, interest_amount, currency_id),
-        )
+        entries.append((operation_id, interest_income_id, 0, interest_amount, currency_id))
     # Credit commission income
     if commissions_amount > 0:
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, 0, ?, ?)",
-            (operation_id, commission_income_id, commissions_amount, currency_id),
-        )
+        entries.append((operation_id, commission_income_id, 0, commissions_amount, currency_id))
     # Debit expense (if expenses)
     if expenses_amount > 0:
-        cur.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) VALUES (?, ?, ?, 0, ?)",
-            (operation_id, commission_expense_id, expenses_amount, currency_id),
-        )
+        entries.append((operation_id, commission_expense_id, expenses_amount, 0, currency_id))
+    cur.executemany(SQL_INSERT_JOURNAL_ENTRY, entries)
     db.commit()
     return {
         "operation_id": operation_id,
@@ -535,7 +850,7 @@ def create_cheque_buy(op: ChequeBuyOperationCreate, user: str = Depends(get_curr
 
 
 @app.get("/reports/cheques")
-def list_cheques(status: Optional[str] = None, db: sqlite3.Connection = Depends(get_db_connection), user: str = Depends(get_current_user)):
+def list_cheques(status: Optional[str] = None, db: sqlite3.Connection = Depends(get_reader), user: dict = Depends(get_current_user)):
     cur = db.cursor()
     query = "SELECT id, bank, number, nominal_amount, due_date, expected_accreditation_date, net_amount, status FROM cheques"
     params = []
@@ -543,13 +858,12 @@ def list_cheques(status: Optional[str] = None, db: sqlite3.Connection = Depends(
         query += " WHERE status = ?"
         params.append(status)
     cur.execute(query, params)
-    rows = cur.fetchall()
-    return [dict(row) for row in rows]
+    return [dict(row) for row in cur]
 
 
 # Client ledger report
 @app.get("/reports/client_ledger")
-def client_ledger(party_name: str, start_date: Optional[str] = None, end_date: Optional[str] = None, currency: Optional[str] = None, db: sqlite3.Connection = Depends(get_db_connection), user: str = Depends(get_current_user)):
+def client_ledger(party_name: str, start_date: Optional[str] = None, end_date: Optional[str] = None, currency: Optional[str] = None, db: sqlite3.Connection = Depends(get_reader), user: dict = Depends(get_current_user)):
     """Return ledger for a given client/supplier within a date range.
 
     - `party_name`: name of the client o proveedor.
@@ -572,7 +886,9 @@ def client_ledger(party_name: str, start_date: Optional[str] = None, end_date: O
     # Build query
     placeholders = ','.join('?' * len(codes))
     query = (
-        "SELECT o.date, ot.code as operation_type, o.notes, je.debit, je.credit, c.code AS currency "
+        "SELECT o.date, ot.code as operation_type, o.notes, je.debit, je.credit, c.code AS currency, "
+        "SUM(COALESCE(je.debit, 0) - COALESCE(je.credit, 0)) "
+        "OVER (PARTITION BY c.code ORDER BY o.date, je.id) AS balance "
         "FROM journal_entries je "
         "JOIN accounts a ON je.account_id = a.id "
         "JOIN operations o ON je.operation_id = o.id "
@@ -590,34 +906,30 @@ def client_ledger(party_name: str, start_date: Optional[str] = None, end_date: O
         params.append(end_date)
     query += " ORDER BY o.date ASC, je.id ASC"
     cur.execute(query, params)
-    rows = cur.fetchall()
-    # Build running balance per currency
-    ledger = []
-    balances = {}
-    for row in rows:
-        cur_code = row[5]
-        balances.setdefault(cur_code, 0)
-        amount = (row[3] or 0) - (row[4] or 0)
-        balances[cur_code] += amount
-        ledger.append({
-            'date': row[0],
-            'operation_type': row[1],
-            'description': row[2],
-            'debit': row[3],
-            'credit': row[4],
-            'currency': cur_code,
-            'balance': balances[cur_code]
-        })
-    return ledger
+    # Running balance per currency comes straight from the window function;
+    # Python only reshapes rows for serialization.
+    return [
+        {
+            'date': row['date'],
+            'operation_type': row['operation_type'],
+            'description': row['notes'],
+            'debit': row['debit'],
+            'credit': row['credit'],
+            'currency': row['currency'],
+            'balance': row['balance'],
+        }
+        for row in cur
+    ]
 
 
 # Update cheque status
 @app.post("/cheques/{cheque_id}/status")
-def update_cheque_status(cheque_id: int, new_status: str, db: sqlite3.Connection = Depends(get_db_connection), user: str = Depends(get_current_user)):
+def update_cheque_status(cheque_id: int, new_status: str, db: sqlite3.Connection = Depends(get_writer), user: dict = Depends(get_current_user)):
     valid_status = {"pending", "accredited", "expired", "rejected", "cancelled"}
     if new_status not in valid_status:
         raise HTTPException(status_code=400, detail="Invalid status")
     cur = db.cursor()
+    cur.execute("BEGIN IMMEDIATE")
     cur.execute("SELECT id FROM cheques WHERE id = ?", (cheque_id,))
     if not cur.fetchone():
         raise HTTPException(status_code=404, detail="Cheque not found")
@@ -3,6 +3,11 @@ from .user import User
 from .account import Account
 from .currency import Currency
 from .operation_type import OperationType
+from .party import Party
 from .operation import Operation
 from .journal_entry import JournalEntry
-from .journal_entry_line import JournalEntryLine
+from .fx_detail import FXDetail
+from .cheque import Cheque, ChequeStatus
+from .payment_detail import PaymentDetail
+from .receipt_detail import ReceiptDetail
+from .money import MoneyType
@@ -5,8 +5,10 @@ Additional boolean flags indicate special behaviours (cash/bank accounts, client
 accounts, FX result, commission income/expense).
 """
 
-from sqlalchemy import Column, Integer, String, Enum, Boolean
-from sqlalchemy.orm import relationship
+from typing import List, Optional
+
+from sqlalchemy import Enum, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
 from ..database import Base
@@ -23,20 +25,22 @@ class AccountType(str, enum.Enum):
 class Account(Base):
     __tablename__ = "accounts"
 
-    id = Column(Integer, primary_key=True, index=True)
-    code = Column(String, unique=True, nullable=False)
-    name = Column(String, nullable=False)
-    type = Column(Enum(AccountType), nullable=False)
-    parent_id = Column(Integer, nullable=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    code: Mapped[str] = mapped_column(String, unique=True)
+    name: Mapped[str] = mapped_column(String)
+    type: Mapped[AccountType] = mapped_column(Enum(AccountType))
+    parent_id: Mapped[Optional[int]] = mapped_column()
     # Flags for special behaviour
-    is_cash = Column(Boolean, default=False)        # Caja/Banco
-    is_client_account = Column(Boolean, default=False)  # Cuentas por cobrar/pagar
-    is_fx_result = Column(Boolean, default=False)   # Resultado por tipo de cambio
-    is_commission_income = Column(Boolean, default=False)
-    is_commission_expense = Column(Boolean, default=False)
+    is_cash: Mapped[Optional[bool]] = mapped_column(default=False)        # Caja/Banco
+    is_client_account: Mapped[Optional[bool]] = mapped_column(default=False)  # Cuentas por cobrar/pagar
+    is_fx_result: Mapped[Optional[bool]] = mapped_column(default=False)   # Resultado por tipo de cambio
+    is_commission_income: Mapped[Optional[bool]] = mapped_column(default=False)
+    is_commission_expense: Mapped[Optional[bool]] = mapped_column(default=False)
 
     # Relationships
-    journal_entries = relationship("JournalEntry", back_populates="account")
+    journal_entries: Mapped[List["JournalEntry"]] = relationship(
+        "JournalEntry", back_populates="account"
+    )
 
     def __repr__(self) -> str:
-        return f"<Account(code={self.code}, name={self.name})>"
\ No newline at end of file
+        return f"<Account(code={self.code}, name={self.name})>"
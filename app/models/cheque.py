@@ -4,14 +4,22 @@ Each cheque belongs to an operation and contains specific financial details.
 """
 
 from datetime import date
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, Date, String, Enum
-from sqlalchemy.orm import relationship
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import CheckConstraint, Computed, Date, ForeignKey, Index, Numeric, String, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
+from .money import MoneyType
+
 from ..database import Base
 
 
 class ChequeStatus(str, enum.Enum):
+    """Application-level status values; the column itself is a plain string
+    guarded by a CHECK constraint, avoiding per-row enum coercion."""
+
     PENDING = "pending"
     ACCREDITED = "accredited"
     EXPIRED = "expired"
@@ -21,28 +29,68 @@ class ChequeStatus(str, enum.Enum):
 
 class Cheque(Base):
     __tablename__ = "cheques"
+    __table_args__ = (
+        # Pending-cheque reports filter on status='pending' and order by
+        # maturity; the partial index stays small and cache-resident. On
+        # Postgres it also covers the amount columns the report reads.
+        Index(
+            "ix_cheques_pending",
+            "due_date",
+            sqlite_where=text("status = 'pending'"),
+            postgresql_where=text("status = 'pending'"),
+            postgresql_include=["nominal_amount", "currency_id"],
+        ),
+        Index("ix_cheques_op", "operation_id"),
+        CheckConstraint(
+            "status IN ('pending','accredited','expired','rejected','cancelled')",
+            name="ck_cheque_status",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    operation_id: Mapped[int] = mapped_column(
+        ForeignKey("operations.id", deferrable=True, initially="DEFERRED")
+    )
+    party_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("parties.id", deferrable=True, initially="DEFERRED")
+    )
+    bank: Mapped[str] = mapped_column(String)
+    number: Mapped[str] = mapped_column(String)
+    nominal_amount: Mapped[Decimal] = mapped_column(MoneyType)
+    issue_date: Mapped[Optional[date]] = mapped_column(Date)
+    due_date: Mapped[date] = mapped_column(Date)
+    expected_accreditation_date: Mapped[Optional[date]] = mapped_column(Date)
+    interest_rate: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 4))  # annual rate
+    interest_base: Mapped[Optional[int]] = mapped_column(default=365)  # base days for calculation
+    expenses: Mapped[Optional[Decimal]] = mapped_column(MoneyType, default=0)
+    commissions: Mapped[Optional[Decimal]] = mapped_column(MoneyType, default=0)
+    # Stored generated column: the DB derives the net from nominal minus
+    # discount interest (issue->due days over the base) minus costs, so it
+    # can never drift from its inputs and is never re-written from Python.
+    # All amounts are integer cents (MoneyType), hence the ROUND/CAST.
+    net_amount: Mapped[Optional[Decimal]] = mapped_column(
+        MoneyType,
+        Computed(
+            "CAST(ROUND(nominal_amount - COALESCE(expenses, 0) - COALESCE(commissions, 0) "
+            "- nominal_amount * COALESCE(interest_rate, 0) "
+            "* (julianday(due_date) - julianday(COALESCE(issue_date, due_date))) "
+            "/ interest_base) AS INTEGER)",
+            persisted=True,
+        ),
+    )
+    status: Mapped[str] = mapped_column(
+        String(16), default=ChequeStatus.PENDING.value, index=True
+    )
+    currency_id: Mapped[int] = mapped_column(
+        ForeignKey("currencies.id", deferrable=True, initially="DEFERRED")
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    operation_id = Column(Integer, ForeignKey("operations.id"), nullable=False)
-    party_id = Column(Integer, ForeignKey("parties.id"), nullable=True)
-    bank = Column(String, nullable=False)
-    number = Column(String, nullable=False)
-    nominal_amount = Column(Numeric(18, 2), nullable=False)
-    issue_date = Column(Date, nullable=True)
-    due_date = Column(Date, nullable=False)
-    expected_accreditation_date = Column(Date, nullable=True)
-    interest_rate = Column(Numeric(10, 4), nullable=True)  # annual rate
-    interest_base = Column(Integer, default=365)  # base days for calculation
-    expenses = Column(Numeric(18, 2), default=0)
-    commissions = Column(Numeric(18, 2), default=0)
-    net_amount = Column(Numeric(18, 2), nullable=True)
-    status = Column(Enum(ChequeStatus), default=ChequeStatus.PENDING, index=True)
-    currency_id = Column(Integer, ForeignKey("currencies.id"), nullable=False)
-
-    # Relationships
-    operation = relationship("Operation", back_populates="cheques")
-    currency = relationship("Currency")
-    party = relationship("Party")
+    # Relationships: opt-in loading only (see Operation for rationale).
+    operation: Mapped["Operation"] = relationship(
+        "Operation", back_populates="cheques", lazy="raise"
+    )
+    currency: Mapped["Currency"] = relationship("Currency", lazy="raise")
+    party: Mapped[Optional["Party"]] = relationship("Party", lazy="raise")
 
     def __repr__(self) -> str:
-        return f"<Cheque(id={self.id}, number={self.number}, status={self.status})>"
\ No newline at end of file
+        return f"<Cheque(id={self.id}, number={self.number}, status={self.status})>"
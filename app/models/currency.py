@@ -3,7 +3,8 @@
 Each currency has an ISO code (e.g. ARS, USD) and a descriptive name.
 """
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import Base
 
@@ -11,9 +12,9 @@ from ..database import Base
 class Currency(Base):
     __tablename__ = "currencies"
 
-    id = Column(Integer, primary_key=True, index=True)
-    code = Column(String(3), unique=True, nullable=False)
-    name = Column(String, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    code: Mapped[str] = mapped_column(String(3), unique=True)
+    name: Mapped[str] = mapped_column(String)
 
     def __repr__(self) -> str:
-        return f"<Currency(code={self.code})>"
\ No newline at end of file
+        return f"<Currency(code={self.code})>"
@@ -5,10 +5,14 @@ whether it was a buy or sell. The exchange rate is stored in the Operation
 record.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, Enum
-from sqlalchemy.orm import relationship
+from decimal import Decimal
+
+from sqlalchemy import CheckConstraint, ForeignKey, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
+from .money import MoneyType
+
 from ..database import Base
 
 
@@ -19,15 +23,22 @@ class FXType(str, enum.Enum):
 
 class FXDetail(Base):
     __tablename__ = "fx_details"
-
-    id = Column(Integer, primary_key=True, index=True)
-    operation_id = Column(Integer, ForeignKey("operations.id"), nullable=False, unique=True)
-    usd_amount = Column(Numeric(18, 2), nullable=False)
-    ars_amount = Column(Numeric(18, 2), nullable=False)
-    fx_type = Column(Enum(FXType), nullable=False)
+    __table_args__ = (
+        CheckConstraint("fx_type IN ('buy','sell')", name="ck_fx_type"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    operation_id: Mapped[int] = mapped_column(
+        ForeignKey("operations.id", deferrable=True, initially="DEFERRED"), unique=True
+    )
+    usd_amount: Mapped[Decimal] = mapped_column(MoneyType)
+    ars_amount: Mapped[Decimal] = mapped_column(MoneyType)
+    fx_type: Mapped[str] = mapped_column(String(4))
 
     # Relationships
-    operation = relationship("Operation", back_populates="fx_detail")
+    operation: Mapped["Operation"] = relationship(
+        "Operation", back_populates="fx_detail", lazy="raise"
+    )
 
     def __repr__(self) -> str:
-        return f"<FXDetail(op={self.operation_id}, type={self.fx_type}, usd={self.usd_amount})>"
\ No newline at end of file
+        return f"<FXDetail(op={self.operation_id}, type={self.fx_type}, usd={self.usd_amount})>"
@@ -5,26 +5,48 @@ represented as positive numbers (either debit > 0 and credit = 0 or vice versa).
 The currency is stored explicitly to support multi‑currency accounting.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, Numeric
-from sqlalchemy.orm import relationship
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .money import MoneyType
 
 from ..database import Base
 
 
 class JournalEntry(Base):
     __tablename__ = "journal_entries"
-
-    id = Column(Integer, primary_key=True, index=True)
-    operation_id = Column(Integer, ForeignKey("operations.id"), nullable=False)
-    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
-    debit = Column(Numeric(18, 2), default=0)
-    credit = Column(Numeric(18, 2), default=0)
-    currency_id = Column(Integer, ForeignKey("currencies.id"), nullable=False)
-
-    # Relationships
-    operation = relationship("Operation", back_populates="journal_entries")
-    account = relationship("Account", back_populates="journal_entries")
-    currency = relationship("Currency")
+    __table_args__ = (
+        # Covering index for position reports: the aggregate over
+        # (account_id, currency_id) reads debit/credit straight from the index.
+        Index("ix_je_acct_cur_cover", "account_id", "currency_id", "debit", "credit"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    operation_id: Mapped[int] = mapped_column(
+        ForeignKey("operations.id", deferrable=True, initially="DEFERRED")
+    )
+    account_id: Mapped[int] = mapped_column(
+        ForeignKey("accounts.id", deferrable=True, initially="DEFERRED")
+    )
+    debit: Mapped[Optional[Decimal]] = mapped_column(MoneyType, default=0)
+    credit: Mapped[Optional[Decimal]] = mapped_column(MoneyType, default=0)
+    currency_id: Mapped[int] = mapped_column(
+        ForeignKey("currencies.id", deferrable=True, initially="DEFERRED")
+    )
+
+    # Relationships. Reports iterate journal entries and touch the related
+    # operation/account rows, so load them with selectin (3 IN-list queries
+    # per report instead of N+1 lazy loads).
+    operation: Mapped["Operation"] = relationship(
+        "Operation", back_populates="journal_entries", lazy="selectin"
+    )
+    account: Mapped["Account"] = relationship(
+        "Account", back_populates="journal_entries", lazy="selectin"
+    )
+    currency: Mapped["Currency"] = relationship("Currency", lazy="raise")
 
     def __repr__(self) -> str:
-        return f"<JournalEntry(op={self.operation_id}, acc={self.account_id}, debit={self.debit}, credit={self.credit})>"
\ No newline at end of file
+        return f"<JournalEntry(op={self.operation_id}, acc={self.account_id}, debit={self.debit}, credit={self.credit})>"
@@ -0,0 +1,30 @@
+"""Custom column type for monetary amounts.
+
+Money is stored as integer cents (BIGINT) so comparisons, sums and index
+scans run on native 64-bit integers instead of variable-width NUMERIC
+(which SQLite stores as text and Postgres computes in software). Python
+code keeps working with Decimal; the conversion happens at the bind/result
+boundary. Rates and percentages stay NUMERIC — only amounts are rescaled.
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+
+class MoneyType(TypeDecorator):
+    """Decimal amounts in Python <-> integer cents in the database."""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(round(Decimal(str(value)) * 100))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Decimal(value) / 100
@@ -7,35 +7,75 @@ tables (fx_details, cheques).
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Numeric, String
-from sqlalchemy.orm import relationship
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import DateTime, ForeignKey, Index, Numeric, String, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column, relationship
+
+from .money import MoneyType
+from .operation_type import OperationType
 
 from ..database import Base
 
 
 class Operation(Base):
     __tablename__ = "operations"
+    __table_args__ = (
+        # Client ledgers filter by party and date range.
+        Index("ix_op_party_date", "party_id", "date"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    date: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), index=True
+    )
+    operation_type_id: Mapped[int] = mapped_column(ForeignKey("operation_types.id"))
+    party_id: Mapped[Optional[int]] = mapped_column(ForeignKey("parties.id"))
+    amount: Mapped[Decimal] = mapped_column(MoneyType)
+    currency_id: Mapped[int] = mapped_column(ForeignKey("currencies.id"))
+    exchange_rate: Mapped[Optional[Decimal]] = mapped_column(Numeric(18, 4))
+    notes: Mapped[Optional[str]] = mapped_column(String)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+
+    # Human-readable type code without walking the relationship; deferred so
+    # it is only queried on explicit access.
+    operation_type_code = column_property(
+        select(OperationType.code)
+        .where(OperationType.id == operation_type_id)
+        .correlate_except(OperationType)
+        .scalar_subquery(),
+        deferred=True,
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    date = Column(DateTime, default=datetime.utcnow, index=True)
-    operation_type_id = Column(Integer, ForeignKey("operation_types.id"), nullable=False)
-    party_id = Column(Integer, ForeignKey("parties.id"), nullable=True)
-    amount = Column(Numeric(18, 2), nullable=False)
-    currency_id = Column(Integer, ForeignKey("currencies.id"), nullable=False)
-    exchange_rate = Column(Numeric(18, 4), nullable=True)
-    notes = Column(String, nullable=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-
-    # Relationships
-    operation_type = relationship("OperationType")
-    party = relationship("Party", back_populates="operations")
-    currency = relationship("Currency")
-    user = relationship("User", back_populates="operations")
-    journal_entries = relationship("JournalEntry", back_populates="operation", cascade="all, delete-orphan")
-    fx_detail = relationship("FXDetail", back_populates="operation", uselist=False, cascade="all, delete-orphan")
-    cheques = relationship("Cheque", back_populates="operation", cascade="all, delete-orphan")
-    payment_detail = relationship("PaymentDetail", back_populates="operation", uselist=False, cascade="all, delete-orphan")
-    receipt_detail = relationship("ReceiptDetail", back_populates="operation", uselist=False, cascade="all, delete-orphan")
+    # Relationships. operation_type and party are shown on every report row,
+    # so eager-load them with selectin to avoid N+1 lazy loads. Everything
+    # else is lazy="raise": callers must opt in with selectinload(...), so an
+    # accidental per-row lazy load fails loudly instead of silently issuing
+    # N queries.
+    operation_type: Mapped["OperationType"] = relationship("OperationType", lazy="selectin")
+    party: Mapped[Optional["Party"]] = relationship(
+        "Party", back_populates="operations", lazy="selectin"
+    )
+    currency: Mapped["Currency"] = relationship("Currency", lazy="raise")
+    user: Mapped["User"] = relationship("User", back_populates="operations", lazy="raise")
+    journal_entries: Mapped[List["JournalEntry"]] = relationship(
+        "JournalEntry", back_populates="operation", cascade="all, delete-orphan", lazy="raise"
+    )
+    fx_detail: Mapped[Optional["FXDetail"]] = relationship(
+        "FXDetail", back_populates="operation", uselist=False, cascade="all, delete-orphan", lazy="raise"
+    )
+    cheques: Mapped[List["Cheque"]] = relationship(
+        "Cheque", back_populates="operation", cascade="all, delete-orphan", lazy="raise"
+    )
+    payment_detail: Mapped[Optional["PaymentDetail"]] = relationship(
+        "PaymentDetail", back_populates="operation", uselist=False, cascade="all, delete-orphan", lazy="raise"
+    )
+    receipt_detail: Mapped[Optional["ReceiptDetail"]] = relationship(
+        "ReceiptDetail", back_populates="operation", uselist=False, cascade="all, delete-orphan", lazy="raise"
+    )
 
     def __repr__(self) -> str:
-        return f"<Operation(id={self.id}, type={self.operation_type.code}, date={self.date.date()})>"
\ No newline at end of file
+        # Loaded columns only: repr must never fire a lazy SELECT or raise
+        # DetachedInstanceError from inside a log line or traceback.
+        return f"<Operation(id={self.id}, type_id={self.operation_type_id}, date={self.date})>"
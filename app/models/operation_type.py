@@ -3,7 +3,8 @@
 Examples: FX_BUY, FX_SELL, PAYMENT, RECEIPT, CHEQUE_BUY, CHEQUE_SELL.
 """
 
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
 
 from ..database import Base
 
@@ -11,9 +12,9 @@ from ..database import Base
 class OperationType(Base):
     __tablename__ = "operation_types"
 
-    id = Column(Integer, primary_key=True, index=True)
-    code = Column(String, unique=True, nullable=False)
-    description = Column(String, nullable=False)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    code: Mapped[str] = mapped_column(String, unique=True)
+    description: Mapped[str] = mapped_column(String)
 
     def __repr__(self) -> str:
-        return f"<OperationType(code={self.code})>"
\ No newline at end of file
+        return f"<OperationType(code={self.code})>"
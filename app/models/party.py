@@ -3,9 +3,11 @@
 The `Party` table stores information about clients and providers.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Enum
-from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import CheckConstraint, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
 from ..database import Base
@@ -18,18 +20,25 @@ class PartyType(str, enum.Enum):
 
 class Party(Base):
     __tablename__ = "parties"
-
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
-    type = Column(Enum(PartyType), default=PartyType.CLIENT)
-    email = Column(String, nullable=True)
-    phone = Column(String, nullable=True)
-    address = Column(String, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        CheckConstraint("type IN ('client','supplier')", name="ck_party_type"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String, unique=True, index=True)
+    type: Mapped[Optional[str]] = mapped_column(String(16), default=PartyType.CLIENT.value)
+    email: Mapped[Optional[str]] = mapped_column(String)
+    phone: Mapped[Optional[str]] = mapped_column(String)
+    address: Mapped[Optional[str]] = mapped_column(String)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    # SQLite ignores server_onupdate; a trigger in schema.sql keeps
+    # updated_at fresh there.
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), server_onupdate=func.now()
+    )
 
     # Relationships
-    operations = relationship("Operation", back_populates="party")
+    operations: Mapped[List["Operation"]] = relationship("Operation", back_populates="party")
 
     def __repr__(self) -> str:
-        return f"<Party(id={self.id}, name={self.name})>"
\ No newline at end of file
+        return f"<Party(id={self.id}, name={self.name})>"
@@ -2,8 +2,13 @@
 Includes gross amount, commission, expenses and payment method.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, Numeric, String
-from sqlalchemy.orm import relationship
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import ForeignKey, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .money import MoneyType
 
 from ..database import Base
 
@@ -11,16 +16,20 @@ from ..database import Base
 class ReceiptDetail(Base):
     __tablename__ = "receipt_details"
 
-    id = Column(Integer, primary_key=True, index=True)
-    operation_id = Column(Integer, ForeignKey("operations.id"), nullable=False, unique=True)
-    gross_amount = Column(Numeric(18, 2), nullable=False)
-    commission_amount = Column(Numeric(18, 2), default=0)
-    commission_percentage = Column(Numeric(10, 4), nullable=True)
-    expenses_amount = Column(Numeric(18, 2), default=0)
-    payment_method = Column(String, nullable=True)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    operation_id: Mapped[int] = mapped_column(
+        ForeignKey("operations.id", deferrable=True, initially="DEFERRED"), unique=True
+    )
+    gross_amount: Mapped[Decimal] = mapped_column(MoneyType)
+    commission_amount: Mapped[Optional[Decimal]] = mapped_column(MoneyType, default=0)
+    commission_percentage: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 4))
+    expenses_amount: Mapped[Optional[Decimal]] = mapped_column(MoneyType, default=0)
+    payment_method: Mapped[Optional[str]] = mapped_column(String)
 
     # Relationships
-    operation = relationship("Operation", back_populates="receipt_detail")
+    operation: Mapped["Operation"] = relationship(
+        "Operation", back_populates="receipt_detail", lazy="raise"
+    )
 
     def __repr__(self) -> str:
-        return f"<ReceiptDetail(op={self.operation_id}, gross={self.gross_amount})>"
\ No newline at end of file
+        return f"<ReceiptDetail(op={self.operation_id}, gross={self.gross_amount})>"
@@ -5,8 +5,10 @@ hashes. Additional flags like `is_admin` can be used for permission checks.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
-from sqlalchemy.orm import relationship
+from typing import List, Optional
+
+from sqlalchemy import DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..database import Base
 
@@ -14,16 +16,18 @@ from ..database import Base
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
-    is_active = Column(Boolean, default=True)
-    is_admin = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(primary_key=True, index=True)
+    email: Mapped[str] = mapped_column(String, unique=True, index=True)
+    hashed_password: Mapped[str] = mapped_column(String)
+    is_active: Mapped[Optional[bool]] = mapped_column(default=True)
+    is_admin: Mapped[Optional[bool]] = mapped_column(default=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, server_default=func.now(), server_onupdate=func.now()
+    )
 
     # Relationships
-    operations = relationship("Operation", back_populates="user")
+    operations: Mapped[List["Operation"]] = relationship("Operation", back_populates="user")
 
     def __repr__(self) -> str:
-        return f"<User(id={self.id}, email={self.email})>"
\ No newline at end of file
+        return f"<User(id={self.id}, email={self.email})>"
@@ -3,9 +3,10 @@ In later phases this module will provide endpoints to manage the chart of accoun
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 
-router = APIRouter(prefix="/accounts", tags=["accounts"])
+router = APIRouter(default_response_class=ORJSONResponse, prefix="/accounts", tags=["accounts"])
 
 @router.get("/ping")
 def ping():
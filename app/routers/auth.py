@@ -4,9 +4,10 @@ In a later phase, this module will implement user login and token generation.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(default_response_class=ORJSONResponse, prefix="/auth", tags=["auth"])
 
 @router.get("/ping")
 def ping():
@@ -3,9 +3,10 @@ Will include endpoints to create FX, payment, receipt and cheque operations.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 
-router = APIRouter(prefix="/operations", tags=["operations"])
+router = APIRouter(default_response_class=ORJSONResponse, prefix="/operations", tags=["operations"])
 
 @router.get("/ping")
 def ping():
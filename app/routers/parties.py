@@ -3,9 +3,10 @@ Provides CRUD endpoints for clients and suppliers (parties).
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 
-router = APIRouter(prefix="/parties", tags=["parties"])
+router = APIRouter(default_response_class=ORJSONResponse, prefix="/parties", tags=["parties"])
 
 @router.get("/ping")
 def ping():
@@ -1,12 +1,71 @@
-"""Report routes placeholder.
-Will provide endpoints for positions, client ledgers and cheque listings.
+"""Report routes.
+
+Aggregations run in the database and return plain rows — the reports only
+need sums per account/currency, so hydrating ORM objects row by row would
+spend memory and time on attributes nobody reads.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select, type_coerce
+from sqlalchemy.orm import Session
+
+from ..database import get_db
+from ..models.cheque import Cheque
+from ..models.journal_entry import JournalEntry
+from ..models.money import MoneyType
+
+
+router = APIRouter(default_response_class=ORJSONResponse, prefix="/reports", tags=["reports"])
+
+# Built once at import; grouping over the covering ix_je_acct_cur_cover
+# index means the whole report is an index-only aggregate in the DB.
+_POSITION_STMT = (
+    select(
+        JournalEntry.account_id,
+        JournalEntry.currency_id,
+        # SUM() loses the MoneyType cents->Decimal result processing, so
+        # coerce it back; the arithmetic itself stays on integer cents.
+        type_coerce(
+            func.sum(JournalEntry.debit - JournalEntry.credit), MoneyType
+        ).label("net"),
+    )
+    .group_by(JournalEntry.account_id, JournalEntry.currency_id)
+)
 
+_CHEQUES_STMT = select(
+    Cheque.id,
+    Cheque.bank,
+    Cheque.number,
+    Cheque.nominal_amount,
+    Cheque.due_date,
+    Cheque.status,
+    Cheque.currency_id,
+).order_by(Cheque.due_date)
 
-router = APIRouter(prefix="/reports", tags=["reports"])
 
 @router.get("/ping")
 def ping():
-    return {"message": "reports pong"}
\ No newline at end of file
+    return {"message": "reports pong"}
+
+
+@router.get("/position")
+def position(db: Session = Depends(get_db)):
+    """Net position (debits minus credits) per account and currency."""
+    rows = db.execute(_POSITION_STMT).all()
+    return [
+        {"account_id": account_id, "currency_id": currency_id, "net": net}
+        for account_id, currency_id, net in rows
+    ]
+
+
+@router.get("/cheques")
+def cheques(db: Session = Depends(get_db)):
+    """List cheques ordered by maturity.
+
+    Rows are fetched in server-side batches (yield_per) so a large
+    portfolio never sits in memory twice, and the column-only select
+    skips ORM hydration entirely.
+    """
+    result = db.execute(_CHEQUES_STMT.execution_options(yield_per=1000))
+    return [dict(row._mapping) for row in result]
@@ -0,0 +1 @@
+"""Domain services that sit between the routers and the models."""
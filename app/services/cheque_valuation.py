@@ -0,0 +1,66 @@
+"""Bulk revaluation of pending cheques.
+
+Mark-to-market means recomputing net amounts for the whole pending book
+under a new discount rate. Since Cheque.net_amount is a stored generated
+column derived from interest_rate, revaluation is a single set-based
+UPDATE: the database recomputes every net in C, row by row, with no
+Python loop and no per-row round-trips. A what-if valuation (without
+writing the new rate) is the same arithmetic as a SELECT.
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import Numeric, func, literal, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from ..models.cheque import Cheque, ChequeStatus
+from ..models.money import MoneyType
+
+
+def revalue_pending(session: Session, interest_rate: Decimal) -> int:
+    """Apply a new discount rate to all pending cheques; return the count.
+
+    net_amount is GENERATED ALWAYS AS (...) STORED, so updating the rate
+    is all it takes — the database recomputes each net in the same pass.
+    The caller owns the transaction.
+    """
+    result = session.execute(
+        update(Cheque)
+        .where(Cheque.status == ChequeStatus.PENDING.value)
+        .values(interest_rate=interest_rate)
+    )
+    return result.rowcount
+
+
+def value_pending(session: Session, interest_rate: Decimal):
+    """What-if valuation of the pending book at a given rate, per currency.
+
+    Computes the hypothetical nets in SQL without touching stored rows;
+    returns [(currency_id, total_net)] with totals as Decimal amounts.
+    """
+    # The rate must carry an explicit NUMERIC type; as a bare literal next
+    # to MoneyType columns it would be coerced through the cents bind
+    # processor and arrive 100x too large.
+    rate = literal(interest_rate, Numeric(10, 4))
+    days = func.julianday(Cheque.due_date) - func.julianday(
+        func.coalesce(Cheque.issue_date, Cheque.due_date)
+    )
+    net = (
+        Cheque.nominal_amount
+        - func.coalesce(Cheque.expenses, 0)
+        - func.coalesce(Cheque.commissions, 0)
+        - Cheque.nominal_amount * rate * days / Cheque.interest_base
+    )
+    stmt = (
+        select(
+            Cheque.currency_id,
+            # Round per row before summing — the generated net_amount column
+            # rounds each cheque, so summing rounded nets is the only way the
+            # what-if at the stored rate reconciles exactly with
+            # SUM(net_amount).
+            type_coerce(func.sum(func.round(net)), MoneyType).label("total_net"),
+        )
+        .where(Cheque.status == ChequeStatus.PENDING.value)
+        .group_by(Cheque.currency_id)
+    )
+    return session.execute(stmt).all()
@@ -4,10 +4,12 @@ We use passlib's CryptContext to generate and verify password hashes. A helper
 function generates JWT tokens (to be implemented in Phase 2).
 """
 
-from datetime import datetime, timedelta
+import hashlib
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from jose import jwt
+import orjson
+from jwt import PyJWS
 from passlib.context import CryptContext
 
 # Configure the password hashing context for bcrypt
@@ -18,9 +20,42 @@ SECRET_KEY = "CHANGE_ME_SECRET"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
+# Encoded once at import; the PyJWS instance reuses its algorithm registry
+# across calls instead of re-parsing "HS256" per token.
+SECRET_KEY_BYTES = SECRET_KEY.encode()
+_jws = PyJWS()
+_DEFAULT_EXPIRE_DELTA = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+
+# bcrypt deliberately takes ~100 ms, so repeated logins by the same user
+# re-pay that cost on every request. Successful verifications are memoized,
+# keyed on a keyed BLAKE2 digest of the plaintext (never the plaintext
+# itself) plus the stored hash. Failures are never cached, so wrong guesses
+# always pay full bcrypt cost.
+_VERIFY_CACHE: dict = {}
+_VERIFY_CACHE_MAX = 1024
+
+
+def _password_digest(plain_password: str) -> bytes:
+    return hashlib.blake2b(
+        plain_password.encode(), key=SECRET_KEY_BYTES, digest_size=16
+    ).digest()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    key = (_password_digest(plain_password), hashed_password)
+    if _VERIFY_CACHE.get(key):
+        return True
+    result = pwd_context.verify(plain_password, hashed_password)
+    if result:
+        if len(_VERIFY_CACHE) >= _VERIFY_CACHE_MAX:
+            _VERIFY_CACHE.clear()
+        _VERIFY_CACHE[key] = True
+    return result
+
+
+def clear_password_cache() -> None:
+    """Drop memoized verifications (call after a password change)."""
+    _VERIFY_CACHE.clear()
 
 
 def get_password_hash(password: str) -> str:
@@ -30,10 +65,6 @@ def get_password_hash(password: str) -> str:
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT token with an expiration time."""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    expire = datetime.now(timezone.utc) + (expires_delta or _DEFAULT_EXPIRE_DELTA)
+    to_encode["exp"] = int(expire.timestamp())
+    return _jws.encode(orjson.dumps(to_encode), SECRET_KEY_BYTES, algorithm=ALGORITHM)
\ No newline at end of file
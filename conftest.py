@@ -0,0 +1,131 @@
+"""Shared pytest fixtures for the sqlite API tests.
+
+The seeded database (schema + reference data + admin user) is built once
+per session into a private in-memory template. Each test that needs a
+database gets its own shared-cache in-memory copy, cloned from the
+template with sqlite3's backup API (a bulk page copy), and the app's
+DB_FILE is pointed at the copy's URI. No test touches the filesystem, and
+the schema/seed cost is paid exactly once.
+"""
+
+import itertools
+import os
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.main_sqlite as main_sqlite
+from init_db_sqlite import insert_initial_data, run_schema
+
+# Relax the app's durability pragmas (synchronous=OFF) for the suite;
+# must be set before any pool connection is opened.
+os.environ["TESTING"] = "1"
+# Seed admin with the cheap legacy hash: the API's dual-read verify still
+# accepts it, and neither seeding nor the single session login then pays
+# the deliberate PBKDF2 key-derivation cost.
+os.environ["FAST_SEED"] = "1"
+
+_db_counter = itertools.count()
+
+
+@pytest.fixture
+def anyio_backend():
+    """Run async tests on asyncio via the anyio plugin bundled with starlette."""
+    return "asyncio"
+
+# Parties the operation tests post against; seeding them into the template
+# (one executemany inside the seed transaction) saves each test a /parties
+# round trip. The endpoints upsert by name, so this changes nothing else.
+_SEED_PARTIES = [
+    ("Cliente Cheque", "client"),
+    ("Proveedor X", "supplier"),
+    ("Cliente Y", "client"),
+    ("Cliente Ledger", "client"),
+]
+
+
+def seed_parties(cursor, rows):
+    """Bulk-insert setup parties with one executemany.
+
+    For prep data the HTTP layer is pure overhead (ASGI round trip,
+    validation, one commit per row); tests that need extra parties should
+    call this inside their own transaction instead of POSTing /parties.
+    """
+    cursor.executemany("INSERT INTO parties (name, type) VALUES (?, ?)", rows)
+
+
+@pytest.fixture(scope="session")
+def template_db():
+    conn = sqlite3.connect(":memory:", isolation_level=None)
+    cursor = conn.cursor()
+    # run_schema opens the transaction; everything lands in one commit.
+    run_schema(cursor)
+    insert_initial_data(cursor)
+    seed_parties(cursor, _SEED_PARTIES)
+    cursor.execute("COMMIT")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session.
+
+    Entering the client runs the ASGI lifespan once (startup events, httpx
+    transport); per-test isolation comes from the database clones, so the
+    app object itself is safe to share.
+    """
+    with TestClient(main_sqlite.app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def auth_headers(template_db, client):
+    """Admin Authorization headers, obtained from one login per session.
+
+    Tokens live in the app's in-memory store, not the database, so a single
+    login against a throwaway copy of the template yields headers every
+    test can reuse without re-paying the password verification.
+    """
+    uri = "file:testdb-auth?mode=memory&cache=shared"
+    holder = sqlite3.connect(uri, uri=True)
+    template_db.backup(holder)
+    original = main_sqlite.DB_FILE
+    main_sqlite.DB_FILE = uri
+    try:
+        resp = client.post(
+            "/auth/login", json={"email": "admin@example.com", "password": "admin"}
+        )
+        assert resp.status_code == 200
+        token = resp.json()["access_token"]
+    finally:
+        main_sqlite.DB_FILE = original
+        holder.close()
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def ready_client(db, client, auth_headers):
+    """The shared client plus admin headers, on a fresh seeded database.
+
+    Bundles everything the operation tests need so each test body is just
+    the endpoint calls and assertions under test.
+    """
+    return client, auth_headers
+
+
+@pytest.fixture
+def db(template_db, monkeypatch):
+    """A fresh seeded in-memory database, wired into the app.
+
+    Each copy lives in its own shared-cache memory database so the app's
+    connection pools can open it by URI; the holder connection keeps it
+    alive for the duration of the test.
+    """
+    uri = f"file:testdb{next(_db_counter)}?mode=memory&cache=shared"
+    holder = sqlite3.connect(uri, uri=True)
+    template_db.backup(holder)
+    monkeypatch.setattr(main_sqlite, "DB_FILE", uri)
+    yield holder
+    holder.close()
@@ -5,12 +5,13 @@ specification. It creates parties as needed, inserts operations, fx_details and
 journal entries, and then prints the resulting USD net position.
 """
 
-import sqlite3
-from datetime import datetime
+from app.db_sqlite import connect
 
 
 DB_FILE = "finance.db"
 
+_FX_TYPE_TO_CODE = {"buy": "FX_BUY", "sell": "FX_SELL"}
+
 
 def get_id(cursor, table, code_col, code_val):
     cursor.execute(f"SELECT id FROM {table} WHERE {code_col} = ?", (code_val,))
@@ -21,116 +22,174 @@ def get_id(cursor, table, code_col, code_val):
 
 
 def get_party_id(cursor, name):
-    cursor.execute("SELECT id FROM parties WHERE name = ?", (name,))
-    row = cursor.fetchone()
-    if row:
-        return row[0]
-    # insert new party as client
+    """Return the party's id, inserting it as a client if missing.
+
+    parties.name is unique, so a single upsert covers both the hit and the
+    miss path (the no-op DO UPDATE lets RETURNING yield the existing id).
+    """
     cursor.execute(
-        "INSERT INTO parties (name, type) VALUES (?, 'client')",
+        "INSERT INTO parties (name, type) VALUES (?, 'client') "
+        "ON CONFLICT(name) DO UPDATE SET name = excluded.name RETURNING id",
         (name,),
     )
-    return cursor.lastrowid
+    return cursor.fetchone()[0]
 
 
-def insert_fx_operation(cursor, date_str, party_name, fx_type, usd_amount, exchange_rate):
-    """Insert FX buy or sell operation with journal entries."""
-    # Retrieve IDs
-    op_type_code = "FX_BUY" if fx_type == "buy" else "FX_SELL"
+def get_party_ids(cursor, names):
+    """Map many party names to ids in two statements (for bulk seeding)."""
+    unique_names = list(dict.fromkeys(names))
+    cursor.executemany(
+        "INSERT INTO parties (name, type) VALUES (?, 'client') ON CONFLICT(name) DO NOTHING",
+        [(name,) for name in unique_names],
+    )
+    placeholders = ",".join("?" * len(unique_names))
     cursor.execute(
-        "SELECT id FROM operation_types WHERE code = ?", (op_type_code,)
+        f"SELECT name, id FROM parties WHERE name IN ({placeholders})", unique_names
     )
-    operation_type_id = cursor.fetchone()[0]
-    usd_id = get_id(cursor, "currencies", "code", "USD")
-    ars_id = get_id(cursor, "currencies", "code", "ARS")
-    user_id = 1  # admin
-    party_id = get_party_id(cursor, party_name)
+    return dict(cursor.fetchall())
+
 
+def load_ref_ids(cursor):
+    """Load the full reference tables into {code: id} dicts in three SELECTs.
+
+    The seed tables are tiny (a couple dozen rows), so reading them whole
+    replaces a per-lookup round-trip with a dict hit.
+    """
+    return {
+        "op": dict(cursor.execute("SELECT code, id FROM operation_types").fetchall()),
+        "ccy": dict(cursor.execute("SELECT code, id FROM currencies").fetchall()),
+        "acct": dict(cursor.execute("SELECT code, id FROM accounts").fetchall()),
+    }
+
+
+def build_fx_operation(refs, date_str, party_id, fx_type, usd_amount, exchange_rate):
+    """Build the rows for one FX operation without touching the cursor.
+
+    Returns (op_row, fx_row, je_rows); the fx/journal rows omit the
+    operation_id, which is only known after the batched header insert.
+    """
+    operation_type_id = refs["op"][_FX_TYPE_TO_CODE[fx_type]]
+    usd_id = refs["ccy"]["USD"]
+    ars_id = refs["ccy"]["ARS"]
+    caja_usd = refs["acct"]["1020"]
+    caja_ars = refs["acct"]["1010"]
+    user_id = 1  # admin
     ars_amount = round(usd_amount * exchange_rate, 2)
-    # Insert operation header; store amount as USD
-    cursor.execute(
-        "INSERT INTO operations (date, operation_type_id, party_id, amount, currency_id, "
-        "exchange_rate, notes, user_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-        (
-            date_str,
-            operation_type_id,
-            party_id,
-            usd_amount,
-            usd_id,
-            exchange_rate,
-            None,
-            user_id,
-        ),
+    op_row = (
+        date_str,
+        operation_type_id,
+        party_id,
+        usd_amount,
+        usd_id,
+        exchange_rate,
+        None,
+        user_id,
     )
-    operation_id = cursor.lastrowid
-    # Insert fx_details
-    cursor.execute(
-        "INSERT INTO fx_details (operation_id, usd_amount, ars_amount, fx_type) VALUES (?, ?, ?, ?)",
-        (operation_id, usd_amount, ars_amount, fx_type),
-    )
-    # Determine accounts
-    usd_account_id = get_id(cursor, "accounts", "code", "1020")  # Caja USD
-    ars_account_id = get_id(cursor, "accounts", "code", "1010")  # Caja ARS
-    # Insert journal entries
+    fx_row = (usd_amount, ars_amount, fx_type)
     if fx_type == "buy":
         # Debit USD, credit ARS
-        cursor.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) "
-            "VALUES (?, ?, ?, 0, ?)",
-            (operation_id, usd_account_id, usd_amount, usd_id),
-        )
-        cursor.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) "
-            "VALUES (?, ?, 0, ?, ?)",
-            (operation_id, ars_account_id, ars_amount, ars_id),
-        )
+        je_rows = [
+            (caja_usd, usd_amount, 0, usd_id),
+            (caja_ars, 0, ars_amount, ars_id),
+        ]
     else:
         # sell: debit ARS, credit USD
-        cursor.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) "
-            "VALUES (?, ?, ?, 0, ?)",
-            (operation_id, ars_account_id, ars_amount, ars_id),
-        )
-        cursor.execute(
-            "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) "
-            "VALUES (?, ?, 0, ?, ?)",
-            (operation_id, usd_account_id, usd_amount, usd_id),
+        je_rows = [
+            (caja_ars, ars_amount, 0, ars_id),
+            (caja_usd, 0, usd_amount, usd_id),
+        ]
+    return op_row, fx_row, je_rows
+
+
+def insert_fx_operations(cursor, refs, operations):
+    """Insert a batch of (date, party_name, fx_type, usd, rate) tuples.
+
+    One executemany per table instead of four executes per operation. The
+    header ids are harvested in one shot: within a single transaction the
+    batch gets consecutive rowids, so last_insert_rowid() anchors them all.
+    """
+    party_ids = get_party_ids(cursor, [op[1] for op in operations])
+    op_rows, fx_rows, je_rows = [], [], []
+    for date_str, party_name, fx_type, usd_amount, exchange_rate in operations:
+        op_row, fx_row, jes = build_fx_operation(
+            refs, date_str, party_ids[party_name], fx_type, usd_amount, exchange_rate
         )
+        op_rows.append(op_row)
+        fx_rows.append(fx_row)
+        je_rows.append(jes)
+    cursor.executemany(
+        "INSERT INTO operations (date, operation_type_id, party_id, amount, currency_id, "
+        "exchange_rate, notes, user_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        op_rows,
+    )
+    cursor.execute("SELECT last_insert_rowid()")
+    first_id = cursor.fetchone()[0] - len(op_rows) + 1
+    operation_ids = range(first_id, first_id + len(op_rows))
+    cursor.executemany(
+        "INSERT INTO fx_details (operation_id, usd_amount, ars_amount, fx_type) VALUES (?, ?, ?, ?)",
+        [(op_id,) + row for op_id, row in zip(operation_ids, fx_rows)],
+    )
+    cursor.executemany(
+        "INSERT INTO journal_entries (operation_id, account_id, debit, credit, currency_id) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(op_id,) + row for op_id, rows in zip(operation_ids, je_rows) for row in rows],
+    )
 
 
 def compute_usd_position(cursor):
-    """Compute net USD position: debits minus credits for USD cash account."""
+    """Compute net USD position: debits minus credits for USD cash account.
+
+    The currency id is resolved upfront instead of via a correlated
+    subquery, so the aggregate is a pure range scan of the covering
+    ix_je_acct_cur_cover index on (account_id, currency_id, debit, credit).
+    """
     usd_account_id = get_id(cursor, "accounts", "code", "1020")
+    usd_id = get_id(cursor, "currencies", "code", "USD")
+    cursor.execute(
+        "SELECT COALESCE(SUM(debit - credit), 0) FROM journal_entries "
+        "WHERE account_id = ? AND currency_id = ?",
+        (usd_account_id, usd_id),
+    )
+    return cursor.fetchone()[0]
+
+
+def compute_positions(cursor, account_id):
+    """Net position per currency for one account, in a single grouped query."""
     cursor.execute(
-        "SELECT SUM(debit) - SUM(credit) FROM journal_entries "
-        "WHERE account_id = ? AND currency_id = (SELECT id FROM currencies WHERE code = 'USD')",
-        (usd_account_id,),
+        "SELECT currency_id, SUM(debit - credit) FROM journal_entries "
+        "WHERE account_id = ? GROUP BY currency_id",
+        (account_id,),
     )
-    result = cursor.fetchone()[0]
-    return result or 0
+    return dict(cursor.fetchall())
 
 
 def main():
-    conn = sqlite3.connect(DB_FILE)
+    conn = connect(DB_FILE)
     cursor = conn.cursor()
 
     # FX operations sample: day 1 and day 2
     day1 = "2025-12-01"
     day2 = "2025-12-02"
-    # Day 1
-    insert_fx_operation(cursor, day1, "magda", "buy", 1923, 1430)
-    insert_fx_operation(cursor, day1, "magda", "buy", 1177, 1430)
-    insert_fx_operation(cursor, day1, "Plaza", "sell", 2000, 1435)
-    insert_fx_operation(cursor, day1, "MP RL", "sell", 1078, 1459)
-    insert_fx_operation(cursor, day1, "pili", "sell", 300, 1440)
-    insert_fx_operation(cursor, day1, "Plaza", "buy", 400, 1435)
-    # Day 2
-    insert_fx_operation(cursor, day2, "Plaza", "buy", 1100, 1425)
-    insert_fx_operation(cursor, day2, "Rami Cocos", "sell", 1570, 1459)
-    insert_fx_operation(cursor, day2, "Clavo MP", "sell", 3000, 1453)
-    insert_fx_operation(cursor, day2, "Plaza", "buy", 3000, 1425)
-
-    conn.commit()
+    operations = [
+        # Day 1
+        (day1, "magda", "buy", 1923, 1430),
+        (day1, "magda", "buy", 1177, 1430),
+        (day1, "Plaza", "sell", 2000, 1435),
+        (day1, "MP RL", "sell", 1078, 1459),
+        (day1, "pili", "sell", 300, 1440),
+        (day1, "Plaza", "buy", 400, 1435),
+        # Day 2
+        (day2, "Plaza", "buy", 1100, 1425),
+        (day2, "Rami Cocos", "sell", 1570, 1459),
+        (day2, "Clavo MP", "sell", 3000, 1453),
+        (day2, "Plaza", "buy", 3000, 1425),
+    ]
+    # Single explicit transaction for the whole batch (connect() runs in
+    # autocommit, and insert_fx_operations relies on consecutive rowids).
+    cursor.execute("BEGIN")
+    refs = load_ref_ids(cursor)
+    insert_fx_operations(cursor, refs, operations)
+    cursor.execute("COMMIT")
 
     position = compute_usd_position(cursor)
     print(f"Net USD position: {position}")
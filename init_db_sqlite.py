@@ -5,30 +5,72 @@ initial records for currencies, operation types, accounts and an admin user.
 It uses the built‑in `sqlite3` module, so it runs in restricted environments
 without external dependencies.
 
-Note: Passwords are hashed with SHA‑256 for simplicity, but in production you
-should use a stronger algorithm like bcrypt. The admin email and password can
-be overridden via environment variables ADMIN_EMAIL and ADMIN_PASSWORD.
+The admin password is hashed with PBKDF2‑HMAC‑SHA256 in the same format the
+API verifies; set FAST_SEED=1 to fall back to a plain SHA‑256 digest (still
+accepted via the API's legacy dual‑read path) when seeding throwaway
+databases where the key derivation cost matters. The admin email and
+password can be overridden via environment variables ADMIN_EMAIL and
+ADMIN_PASSWORD.
 """
 
 import os
-import sqlite3
 import hashlib
+import secrets
+
+from app.db_sqlite import connect
 
 
 DB_PATH = os.environ.get("DB_PATH", "finance.db")
 SCHEMA_FILE = os.path.join(os.path.dirname(__file__), "schema.sql")
+PBKDF2_ITERATIONS = 100_000
+
+
+def hash_admin_password(password: str) -> str:
+    """Hash the seed admin password in the format the API expects.
+
+    Matches app.main_sqlite.hash_password without importing the app (this
+    script must run with stdlib only). FAST_SEED=1 skips the deliberate
+    PBKDF2 cost and writes a legacy SHA-256 digest instead, which the API
+    still accepts through its dual-read path.
+    """
+    if os.environ.get("FAST_SEED") == "1":
+        return hashlib.sha256(password.encode(), usedforsecurity=False).hexdigest()
+    salt = secrets.token_bytes(16)
+    derived = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, PBKDF2_ITERATIONS)
+    return f"pbkdf2_sha256${PBKDF2_ITERATIONS}${salt.hex()}${derived.hex()}"
 
 
 def run_schema(cursor):
+    """Run the schema DDL inside one transaction and leave it open.
+
+    The leading BEGIN IMMEDIATE makes the whole bootstrap — DDL plus the
+    seed rows the caller inserts afterwards — a single atomic commit
+    instead of one implicit transaction per statement. The caller must
+    finish with COMMIT.
+    """
     with open(SCHEMA_FILE, "r") as f:
         sql = f.read()
-    cursor.executescript(sql)
+    cursor.executescript("BEGIN IMMEDIATE;\n" + sql)
+
+
+def insert_rows(cursor, table, columns, rows):
+    """Insert all rows in one multi-row VALUES statement.
+
+    Unlike executemany this is a single statement with one bind array, so
+    the whole batch is parsed and stepped once.
+    """
+    placeholders = ",".join(["(%s)" % ",".join("?" * len(columns))] * len(rows))
+    flat = [value for row in rows for value in row]
+    cursor.execute(
+        f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES {placeholders}",
+        flat,
+    )
 
 
 def insert_initial_data(cursor):
     # Insert currencies
     currencies = [("ARS", "Argentine Peso"), ("USD", "US Dollar")]
-    cursor.executemany("INSERT OR IGNORE INTO currencies (code, name) VALUES (?, ?)", currencies)
+    insert_rows(cursor, "currencies", ("code", "name"), currencies)
 
     # Operation types
     op_types = [
@@ -39,7 +81,7 @@ def insert_initial_data(cursor):
         ("CHEQUE_BUY", "Compra de cheque"),
         ("CHEQUE_SELL", "Venta de cheque"),
     ]
-    cursor.executemany("INSERT OR IGNORE INTO operation_types (code, description) VALUES (?, ?)", op_types)
+    insert_rows(cursor, "operation_types", ("code", "description"), op_types)
 
     # Accounts
     accounts = [
@@ -58,16 +100,18 @@ def insert_initial_data(cursor):
         ("5400", "Ingresos por intereses", "income", None, 0, 0, 0, 0, 0),
         ("5500", "Gastos por intereses", "expense", None, 0, 0, 0, 0, 0),
     ]
-    cursor.executemany(
-        "INSERT OR IGNORE INTO accounts (code, name, type, parent_id, is_cash, is_client_account, "
-        "is_fx_result, is_commission_income, is_commission_expense) VALUES (?,?,?,?,?,?,?,?,?)",
+    insert_rows(
+        cursor,
+        "accounts",
+        ("code", "name", "type", "parent_id", "is_cash", "is_client_account",
+         "is_fx_result", "is_commission_income", "is_commission_expense"),
         accounts,
     )
 
     # Admin user
     admin_email = os.environ.get("ADMIN_EMAIL", "admin@example.com")
     admin_password = os.environ.get("ADMIN_PASSWORD", "admin")
-    hashed = hashlib.sha256(admin_password.encode()).hexdigest()
+    hashed = hash_admin_password(admin_password)
     cursor.execute(
         "INSERT OR IGNORE INTO users (email, hashed_password, is_active, is_admin) VALUES (?, ?, 1, 1)",
         (admin_email, hashed),
@@ -77,13 +121,14 @@ def insert_initial_data(cursor):
 def main():
     db_file = DB_PATH
     should_create = not os.path.exists(db_file)
-    conn = sqlite3.connect(db_file)
+    conn = connect(db_file)
     cursor = conn.cursor()
     if should_create:
         print(f"Creating database {db_file}…")
+        # One transaction for schema and seed data (run_schema opens it).
         run_schema(cursor)
         insert_initial_data(cursor)
-        conn.commit()
+        cursor.execute("COMMIT")
         print("Database initialised.")
     else:
         print(f"Database {db_file} already exists.")
@@ -0,0 +1,53 @@
+"""One-off migration: merge duplicate party names.
+
+create_party used to do a bare INSERT, so older databases can hold several
+parties with the same name. The API now relies on a unique index on
+parties.name (the get_or_create_party upsert), and creating that index
+fails on such databases. This script keeps the lowest id per name,
+repoints every referencing row at it, deletes the extras and creates the
+unique index. Run it once against the API database (DB_PATH env var,
+default finance.db); it is a no-op on databases without duplicates.
+"""
+
+import os
+import sqlite3
+
+
+DB_FILE = os.environ.get("DB_PATH", "finance.db")
+
+# Tables holding a party_id foreign key.
+PARTY_REFERENCES = ["operations", "cheques"]
+
+
+def main():
+    conn = sqlite3.connect(DB_FILE)
+    cur = conn.cursor()
+    with conn:
+        # Map every duplicate id to the surviving (lowest) id for its name.
+        cur.execute(
+            "CREATE TEMP TABLE party_remap AS "
+            "SELECT p.id AS id, k.keep_id AS keep_id "
+            "FROM parties p "
+            "JOIN (SELECT name, MIN(id) AS keep_id FROM parties GROUP BY name) k "
+            "  ON k.name = p.name "
+            "WHERE p.id <> k.keep_id"
+        )
+        cur.execute("SELECT COUNT(*) FROM party_remap")
+        duplicates = cur.fetchone()[0]
+        for table in PARTY_REFERENCES:
+            cur.execute(
+                f"UPDATE {table} SET party_id = "
+                f"(SELECT keep_id FROM party_remap WHERE party_remap.id = {table}.party_id) "
+                f"WHERE party_id IN (SELECT id FROM party_remap)"
+            )
+        cur.execute("DELETE FROM parties WHERE id IN (SELECT id FROM party_remap)")
+        cur.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_parties_name ON parties (name)")
+    conn.close()
+    if duplicates:
+        print(f"Merged {duplicates} duplicate parties; unique index created.")
+    else:
+        print("No duplicate parties; unique index created.")
+
+
+if __name__ == "__main__":
+    main()
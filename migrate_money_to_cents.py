@@ -0,0 +1,53 @@
+"""One-off migration: rescale stored money amounts to integer cents.
+
+The SQLAlchemy models now store monetary amounts as integer cents (see
+app/models/money.py). Databases created before that change hold the amounts
+as plain decimal values, so each money column must be multiplied by 100
+once. Run this against the SQLAlchemy database file (DATABASE_FILE env var,
+default finance_app.db) after upgrading. Running it twice would rescale
+twice — it refuses to run if a marker row says it already ran.
+"""
+
+import os
+import sqlite3
+
+
+DB_FILE = os.environ.get("DATABASE_FILE", "finance_app.db")
+
+MONEY_COLUMNS = {
+    "operations": ["amount"],
+    "journal_entries": ["debit", "credit"],
+    "fx_details": ["usd_amount", "ars_amount"],
+    "cheques": ["nominal_amount", "expenses", "commissions", "net_amount"],
+    "payment_details": ["gross_amount", "commission_amount", "expenses_amount"],
+    "receipt_details": ["gross_amount", "commission_amount", "expenses_amount"],
+}
+
+
+def main():
+    conn = sqlite3.connect(DB_FILE)
+    cur = conn.cursor()
+    cur.execute(
+        "CREATE TABLE IF NOT EXISTS schema_migrations (name TEXT PRIMARY KEY)"
+    )
+    cur.execute("SELECT 1 FROM schema_migrations WHERE name = 'money_to_cents'")
+    if cur.fetchone():
+        print("money_to_cents already applied; nothing to do.")
+        conn.close()
+        return
+    with conn:
+        for table, columns in MONEY_COLUMNS.items():
+            assignments = ", ".join(
+                f"{col} = CAST(ROUND({col} * 100) AS INTEGER)" for col in columns
+            )
+            conn.execute(f"UPDATE {table} SET {assignments}")
+            print(f"Rescaled {table}: {', '.join(columns)}")
+        conn.execute(
+            "INSERT INTO schema_migrations (name) VALUES ('money_to_cents')"
+        )
+    conn.close()
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,7 @@ CREATE TABLE IF NOT EXISTS currencies (
 -- Parties (clients/suppliers)
 CREATE TABLE IF NOT EXISTS parties (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    name TEXT NOT NULL,
+    name TEXT NOT NULL UNIQUE,
     type TEXT CHECK(type IN ('client','supplier')) DEFAULT 'client',
     email TEXT,
     phone TEXT,
@@ -137,4 +137,22 @@ CREATE TABLE IF NOT EXISTS receipt_details (
     expenses_amount NUMERIC(18,2) DEFAULT 0,
     payment_method TEXT,
     FOREIGN KEY(operation_id) REFERENCES operations(id)
-);
\ No newline at end of file
+);
+-- Indexes for the hot report queries
+CREATE INDEX IF NOT EXISTS ix_je_acct_cur_cover ON journal_entries (account_id, currency_id, debit, credit);
+CREATE INDEX IF NOT EXISTS ix_op_party_date ON operations (party_id, date);
+CREATE INDEX IF NOT EXISTS ix_cheques_status ON cheques (status);
+-- Most cheque reports ask for pending cheques ordered by maturity; the
+-- partial index stays small and hot in cache.
+CREATE INDEX IF NOT EXISTS ix_cheques_pending ON cheques (due_date) WHERE status = 'pending';
+
+-- SQLite has no server-side ON UPDATE default; keep updated_at fresh here.
+CREATE TRIGGER IF NOT EXISTS parties_updated_at AFTER UPDATE ON parties
+BEGIN
+    UPDATE parties SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS users_updated_at AFTER UPDATE ON users
+BEGIN
+    UPDATE users SET updated_at = CURRENT_TIMESTAMP WHERE id = OLD.id;
+END;
@@ -1,22 +1,33 @@
 """Integration tests for the sqlite‑based FastAPI application."""
 
-from fastapi.testclient import TestClient
-from app.main_sqlite import app, DB_FILE
 import os
-import sqlite3
-import hashlib
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+import app.main_sqlite as main_sqlite
+import init_db_sqlite
+from app.main_sqlite import app
+
+# Keep the one on-disk test off spinning storage: /dev/shm is a RAM disk
+# on Linux, so the file I/O this test deliberately exercises never hits
+# the filesystem cache's write-back path.
+_DB_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+_DB_PATH = os.path.join(_DB_DIR, "finance_test.db")
 
 
 def setup_db():
-    # Ensure a fresh database for testing
-    if os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
-    # Recreate DB
-    from init_db_sqlite import main as init_db
-    init_db()
+    # Fresh database: drop the file and its WAL/SHM siblings in one pass
+    # (a stale WAL next to a new file would be replayed into it).
+    for suffix in ("", "-wal", "-shm"):
+        Path(_DB_PATH + suffix).unlink(missing_ok=True)
+    init_db_sqlite.main()
 
 
-def test_login_and_fx_flow():
+def test_login_and_fx_flow(monkeypatch):
+    monkeypatch.setattr(main_sqlite, "DB_FILE", _DB_PATH)
+    monkeypatch.setattr(init_db_sqlite, "DB_PATH", _DB_PATH)
     setup_db()
     client = TestClient(app)
     # Login with admin credentials
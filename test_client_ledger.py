@@ -1,54 +1,66 @@
 """Test client ledger report and cheque status update."""
 
-from fastapi.testclient import TestClient
-from app.main_sqlite import app, DB_FILE
-from init_db_sqlite import main as init_db
-import os
+import asyncio
 
+import orjson
+import pytest
+from httpx import ASGITransport, AsyncClient
 
-def setup_db():
-    if os.path.exists(DB_FILE):
-        os.remove(DB_FILE)
-    init_db()
+from app.main_sqlite import app
 
+_JSON = {"content-type": "application/json"}
 
-def test_client_ledger_and_cheque_status():
-    setup_db()
-    client = TestClient(app)
-    # login
-    resp = client.post("/auth/login", json={"email": "admin@example.com", "password": "admin"})
-    token = resp.json()["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    # Create a client party
-    client.post("/parties", json={"name": "Cliente Ledger", "type": "client"}, headers=headers)
-    # Record a receipt: client pays 1000 ARS with 10% commission
-    client.post(
-        "/operations/receipt",
-        json={
-            "date": "2025-12-08T00:00:00",
-            "party_name": "Cliente Ledger",
-            "currency": "ARS",
-            "gross_amount": 1000,
-            "commission_percentage": 10,
-            "expenses_amount": 0,
-            "payment_method": "efectivo"
-        },
-        headers=headers,
-    )
-    # Record FX sell: client sells 500 USD @ 1400
-    client.post(
-        "/operations/fx",
-        json={
-            "date": "2025-12-09T00:00:00",
-            "party_name": "Cliente Ledger",
-            "fx_type": "sell",
-            "usd_amount": 500,
-            "exchange_rate": 1400
-        },
-        headers=headers,
-    )
-    # Get ledger
-    ledger = client.get("/reports/client_ledger", params={"party_name": "Cliente Ledger"}, headers=headers).json()
+# Payloads serialized once at import.
+# Receipt: client pays 1000 ARS with 10% commission
+RECEIPT_BODY = orjson.dumps({
+    "date": "2025-12-08T00:00:00",
+    "party_name": "Cliente Ledger",
+    "currency": "ARS",
+    "gross_amount": 1000,
+    "commission_percentage": 10,
+    "expenses_amount": 0,
+    "payment_method": "efectivo"
+})
+# FX sell: client sells 500 USD @ 1400
+FX_SELL_BODY = orjson.dumps({
+    "date": "2025-12-09T00:00:00",
+    "party_name": "Cliente Ledger",
+    "fx_type": "sell",
+    "usd_amount": 500,
+    "exchange_rate": 1400
+})
+
+
+@pytest.mark.anyio
+async def test_client_ledger_and_cheque_status(db, auth_headers):
+    # Async test: uses its own AsyncClient, so only the db/header fixtures.
+    headers = auth_headers
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://testserver"
+    ) as ac:
+        # The two writes must stay ordered (the ledger asserts a running
+        # balance over both), but neither needs its response parsed first.
+        await ac.post(
+            "/operations/receipt", content=RECEIPT_BODY, headers={**headers, **_JSON}
+        )
+        await ac.post(
+            "/operations/fx", content=FX_SELL_BODY, headers={**headers, **_JSON}
+        )
+        # The ledger read and the 404 status check are independent of each
+        # other, so pipeline them through the ASGI transport concurrently.
+        ledger_resp, status_resp = await asyncio.gather(
+            ac.get(
+                "/reports/client_ledger",
+                params={"party_name": "Cliente Ledger"},
+                headers=headers,
+            ),
+            ac.post(
+                "/cheques/999/status",
+                params={"new_status": "accredited"},
+                headers=headers,
+            ),
+        )
+    ledger = ledger_resp.json()
     assert len(ledger) > 0
     # Running balance should update per entry; final balance equals sum of debits - credits
     final_balance = ledger[-1]['balance']
@@ -57,5 +69,4 @@ def test_client_ledger_and_cheque_status():
         expected = entry['balance']
     assert final_balance == expected
     # Test update cheque status on nonexistent cheque returns 404
-    resp = client.post("/cheques/999/status", params={"new_status": "accredited"}, headers=headers)
-    assert resp.status_code == 404
\ No newline at end of file
+    assert status_resp.status_code == 404